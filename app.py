@@ -1,24 +1,59 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, g
 from flask_cors import CORS
-import google.generativeai as genai
 import os
 import json
+import queue
 import requests
+import threading
+import time
+from math import ceil
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait, FIRST_COMPLETED
+from response_cache import cache_from_env, make_cache_key
+from semantic_cache import semantic_cache_from_env
+from college_catalog import load_catalog
+from college_index import CollegeIndex
+from geo_distance import haversine_one_to_many
+from http_client import get_session, pool_stats
+from geo_tile_cache import tile_cache_from_env, tile_for, tile_center, tile_half_diagonal_km
+from stream_json import StreamingArrayParser, ParseStats, parse_model_json
+from batch import read_records, run_batch
+from single_flight import SingleFlight
+from circuit_breaker import CircuitOpenError, STATE_CODES, breaker_from_env
+from hedging import hedger_from_env
+import riasec
+from logging_setup import configure_logging, get_logger
+from metrics import Registry, stage, submit_in_context, start_request_timings, stop_request_timings, server_timing_header
+from course_matching import course_tags, rank_colleges
+from prompt_builder import build_compact_prompt, validate_recommendations, matches_schema, PromptBudgetError, GENERATION_CONFIG, RECOMMENDATION_SCHEMA
+
+configure_logging()
+log = get_logger("app")
 
 app = Flask(__name__)
 CORS(app)
 
+# Cache of parsed model responses keyed on normalized quiz answers
+response_cache = cache_from_env()
+
+# Similarity cache that also matches near-duplicate answer sets
+semantic_cache = semantic_cache_from_env()
+
 # Configure API keys from environment
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEOAPIFY_API_KEY = os.getenv("GEOAPIFY_API_KEY")
 
+# Alternative API hosts, e.g. a proxy or the local stand-ins used by benchmarks/load_test.py
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+# "rest" under gevent (see gunicorn.conf.py); the SDK defaults to gRPC
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT")
+
 if not GEMINI_API_KEY:
     print("❌ GEMINI_API_KEY is not set!")
     print("📝 To fix this:")
     print("1. Get your API key from: https://aistudio.google.com/")
     print("2. Set it in PowerShell: $env:GEMINI_API_KEY='your_api_key_here'")
     print("3. Or set it in Command Prompt: set GEMINI_API_KEY=your_api_key_here")
-    raise RuntimeError("GEMINI_API_KEY is not set. Please set it in your environment.")
+    print("⚠️  Recommendation endpoints will fail until it is set; location endpoints still work.")
 
 if not GEOAPIFY_API_KEY:
     print("⚠️  GEOAPIFY_API_KEY is not set!")
@@ -28,343 +63,487 @@ if not GEOAPIFY_API_KEY:
     print("3. Or set it in Command Prompt: set GEOAPIFY_API_KEY=your_api_key_here")
     print("⚠️  Location-based college suggestions will be disabled without this key.")
 
-genai.configure(api_key=GEMINI_API_KEY)
+# The Gemini client and the college catalog are loaded on first use so
+# workers (and geo-only callers) start without paying for either
+_model = None
+_college_index = None
+_model_lock = threading.Lock()
+_catalog_lock = threading.Lock()
+
+
+def get_model():
+    """Configured Gemini model, importing the SDK on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if not GEMINI_API_KEY:
+                    raise RuntimeError("GEMINI_API_KEY is not set. Please set it in your environment.")
+                import google.generativeai as genai
+                options = {}
+                if GEMINI_TRANSPORT:
+                    options["transport"] = GEMINI_TRANSPORT
+                if GEMINI_API_ENDPOINT:
+                    options["transport"] = "rest"
+                    options["client_options"] = {"api_endpoint": GEMINI_API_ENDPOINT}
+                genai.configure(api_key=GEMINI_API_KEY, **options)
+                _model = genai.GenerativeModel("gemini-1.5-flash")
+    return _model
+
+
+def get_college_index():
+    """Fallback college catalog, bucketed into a spatial grid on first use"""
+    global _college_index
+    if _college_index is None:
+        with _catalog_lock:
+            if _college_index is None:
+                _college_index = CollegeIndex(load_catalog(os.getenv("COLLEGE_CATALOG_PATH")))
+    return _college_index
+
+
+def warm_up():
+    """Load the model client and college catalog ahead of the first request"""
+    get_college_index()
+    if GEMINI_API_KEY:
+        get_model()
+
+
+if os.getenv("APP_WARM_UP", "").lower() in ("1", "true", "yes"):
+    threading.Thread(target=warm_up, daemon=True).start()
+
+# Worker pool for running /recommend stages concurrently, with per-stage deadlines in seconds
+stage_executor = ThreadPoolExecutor(max_workers=int(os.getenv("RECOMMEND_STAGE_WORKERS", "32")))
+MODEL_STAGE_TIMEOUT = float(os.getenv("RECOMMEND_MODEL_TIMEOUT", "30"))
+COLLEGES_STAGE_TIMEOUT = float(os.getenv("RECOMMEND_COLLEGES_TIMEOUT", "25"))
+
+# "enrich" asks Gemini for every request but falls back to the local RIASEC
+# scorer for fixed-bank answers when Gemini fails or takes longer than
+# RECOMMEND_ENRICH_TIMEOUT; "rules" scores fixed-bank quiz answers locally
+# and only calls Gemini for free-text answers; "llm" relies on Gemini alone
+RECOMMEND_ENGINE = os.getenv("RECOMMEND_ENGINE", "enrich").lower()
+ENRICH_TIMEOUT = float(os.getenv("RECOMMEND_ENRICH_TIMEOUT", "8"))
+
+# "compact" sends RIASEC answer codes with a JSON response schema within a
+# token budget; "legacy" sends the original prose prompt with a worked example
+PROMPT_STYLE = os.getenv("PROMPT_STYLE", "compact").lower()
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "300"))
+
+# Extra Gemini calls allowed when its output can't be parsed at all
+MODEL_PARSE_RETRIES = max(int(os.getenv("MODEL_PARSE_RETRIES", "1")), 0)
+parse_stats = ParseStats()
+
+# Concurrency and model call rate for /recommend/batch
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+BATCH_RATE = float(os.getenv("BATCH_RATE", "2"))
+
+# Concurrent identical model calls and Geoapify tile searches are merged into one
+model_flight = SingleFlight()
+geoapify_flight = SingleFlight()
+
+# Geoapify place results cached by quantized location
+geo_tile_cache = tile_cache_from_env()
+
+# Geoapify Places API endpoint
+GEOAPIFY_PLACES_URL = os.getenv("GEOAPIFY_PLACES_URL", "https://api.geoapify.com/v2/places")
+EDUCATION_CATEGORIES = ['education', 'university', 'college', 'school']
+EDUCATION_KEYWORDS = ['university', 'college', 'school', 'institute', 'academy']
+
+# Optional mode that sends the category and text searches at the same time
+GEOAPIFY_PARALLEL_SEARCH = os.getenv("GEOAPIFY_PARALLEL_SEARCH", "").lower() in ("1", "true", "yes")
+GEOAPIFY_ENOUGH_RESULTS = int(os.getenv("GEOAPIFY_ENOUGH_RESULTS", "0"))
+GEOAPIFY_SEARCH_DEADLINE = float(os.getenv("GEOAPIFY_SEARCH_DEADLINE", "10"))
+# Most places the Places API returns for one query
+GEOAPIFY_MAX_LIMIT = int(os.getenv("GEOAPIFY_MAX_LIMIT", "500"))
+geo_search_executor = ThreadPoolExecutor(max_workers=int(os.getenv("GEOAPIFY_SEARCH_WORKERS", "16")))
+
+# Prometheus metrics served on /metrics
+metrics = Registry()
+STAGE_SECONDS = metrics.histogram(
+    "sih_stage_duration_seconds", "Time spent in each stage of a request", ("stage",)
+)
+REQUEST_SECONDS = metrics.histogram(
+    "sih_request_duration_seconds", "Time to produce a response, per endpoint", ("endpoint",)
+)
+FALLBACKS = metrics.counter(
+    "sih_college_fallback_total", "College lookups answered from the bundled catalog, by reason", ("reason",)
+)
+UPSTREAM_ERRORS = metrics.counter(
+    "sih_upstream_errors_total", "Failed or timed-out upstream calls", ("upstream", "kind")
+)
+
+# Per-request stage breakdown in a Server-Timing header: always when
+# TIMING_HEADER is set, otherwise only for requests sending "X-Timing: 1"
+TIMING_HEADER = os.getenv("TIMING_HEADER", "").lower() in ("1", "true", "yes")
+
+
+def cache_metrics():
+    """Cache hit/miss counters read from the caches at scrape time"""
+    caches = [("responses", response_cache.stats()), ("geo_tiles", geo_tile_cache.stats())]
+    if semantic_cache is not None:
+        caches.append(("semantic", semantic_cache.stats()))
+    samples = []
+    for cache, stats in caches:
+        for key, result in (("hits", "hit"), ("stale_hits", "stale_hit"), ("misses", "miss")):
+            if key in stats:
+                samples.append(({"cache": cache, "result": result}, stats[key]))
+    return [("sih_cache_lookups_total", "counter", "Cache lookups by cache and result", samples)]
+
 
+metrics.register_collector(cache_metrics)
 
-def find_nearby_colleges(latitude, longitude, radius_km=30, limit=10):
+# Per-upstream circuit breakers (a call slower than the given seconds counts
+# as a failure) and optional hedged requests, enabled with HEDGE_UPSTREAMS
+GEOAPIFY_TIMEOUT = float(os.getenv("GEOAPIFY_TIMEOUT", "10"))
+GEMINI_CALL_TIMEOUT = float(os.getenv("GEMINI_CALL_TIMEOUT", str(MODEL_STAGE_TIMEOUT)))
+geoapify_breaker = breaker_from_env("geoapify", slow_call_seconds=5)
+gemini_breaker = breaker_from_env("gemini", slow_call_seconds=20)
+hedge_executor = ThreadPoolExecutor(max_workers=int(os.getenv("HEDGE_WORKERS", "32")))
+geoapify_hedger = hedger_from_env("geoapify", hedge_executor)
+gemini_hedger = hedger_from_env("gemini", hedge_executor)
+
+
+def upstream_metrics():
+    """Circuit states and hedging counters read at scrape time"""
+    upstreams = [("geoapify", geoapify_breaker, geoapify_hedger), ("gemini", gemini_breaker, gemini_hedger)]
+    states, rejected, hedged, hedge_wins = [], [], [], []
+    for name, breaker, hedger in upstreams:
+        breaker_stats, hedger_stats = breaker.stats(), hedger.stats()
+        states.append(({"upstream": name}, STATE_CODES[breaker_stats["state"]]))
+        rejected.append(({"upstream": name}, breaker_stats["rejected"]))
+        hedged.append(({"upstream": name}, hedger_stats["hedged"]))
+        hedge_wins.append(({"upstream": name}, hedger_stats["hedge_wins"]))
+    return [
+        ("sih_circuit_state", "gauge", "Circuit breaker state (0 closed, 1 open, 2 half-open)", states),
+        ("sih_circuit_rejected_total", "counter", "Calls failed fast by an open circuit", rejected),
+        ("sih_hedged_requests_total", "counter", "Second requests sent after the hedge delay", hedged),
+        ("sih_hedge_wins_total", "counter", "Hedged requests that answered first", hedge_wins),
+    ]
+
+
+metrics.register_collector(upstream_metrics)
+
+
+@app.before_request
+def start_timing():
+    g.request_started = time.perf_counter()
+    if TIMING_HEADER or request.headers.get("X-Timing") == "1":
+        g.stage_timings = start_request_timings()
+
+
+@app.after_request
+def finish_timing(response):
+    elapsed = time.perf_counter() - g.request_started
+    REQUEST_SECONDS.observe(elapsed, request.endpoint or "unknown")
+    timings = g.pop("stage_timings", None)
+    if timings is not None:
+        # Streamed responses only include stages finished before the first byte
+        header = server_timing_header(timings + [("total", elapsed)])
+        response.headers["Server-Timing"] = header
+    return response
+
+
+@app.teardown_request
+def clear_timing(error=None):
+    stop_request_timings()
+
+
+def geoapify_get(stage_name, params):
     """
-    Find nearby educational institutions using Geoapify API
+    GET the Geoapify places API as a timed stage, counting failures.
+    Goes through the Geoapify circuit breaker and, if enabled, hedging.
     """
-    if not GEOAPIFY_API_KEY:
-        print("GEOAPIFY_API_KEY not set, using fallback system")
-        return get_fallback_colleges(latitude, longitude, radius_km)
+    def fetch():
+        response = get_session().get(GEOAPIFY_PLACES_URL, params=params, timeout=GEOAPIFY_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    
+    with stage(STAGE_SECONDS, stage_name):
+        try:
+            return geoapify_breaker.call(lambda: geoapify_hedger.call(fetch))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(stage_name, type(e).__name__)
+            raise
+
+
+def query_geoapify_primary(latitude, longitude, radius_km, limit):
+    """
+    Category search for educational places.
+    Returns None when Geoapify has no features at all for the area.
+    """
+    # Parameters for educational institutions - try different approaches
+    params = {
+        'categories': 'education,university,college',
+        'filter': f'circle:{longitude},{latitude},{int(round(radius_km * 1000))}',  # radius in meters
+        'bias': f'proximity:{longitude},{latitude}',  # nearest first
+        'limit': limit,
+        'apiKey': GEOAPIFY_API_KEY,
+        'lang': 'en',
+        'type': 'amenity'
+    }
+    
+    log.debug("Searching for colleges within %.1fkm of %s, %s", radius_km, latitude, longitude)
+    data = geoapify_get("geoapify_primary", params)
+    log.debug("Geoapify API response: %s", data)
+    
+    if not data.get('features'):
+        return None
+    # Only include actual educational institutions
+    return [
+        feature for feature in data['features']
+        if any(cat in EDUCATION_CATEGORIES for cat in feature.get('properties', {}).get('categories', []))
+    ]
+
+
+def query_geoapify_alternative(latitude, longitude, radius_km, limit):
+    """Free-text search for places that look educational by name or category"""
+    # Try alternative search with different parameters
+    alt_params = {
+        'text': 'university college school education',
+        'filter': f'circle:{longitude},{latitude},{int(round(radius_km * 1000))}',
+        'bias': f'proximity:{longitude},{latitude}',
+        'limit': limit,
+        'apiKey': GEOAPIFY_API_KEY,
+        'lang': 'en'
+    }
     
     try:
-        # Geoapify Places API endpoint
-        url = "https://api.geoapify.com/v2/places"
-        
-        # Parameters for educational institutions - try different approaches
-        params = {
-            'categories': 'education,university,college',
-            'filter': f'circle:{longitude},{latitude},{radius_km * 1000}',  # radius in meters
-            'limit': limit,
-            'apiKey': GEOAPIFY_API_KEY,
-            'lang': 'en',
-            'type': 'amenity'
-        }
-        
-        print(f"Searching for colleges within {radius_km}km of {latitude}, {longitude}")
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        colleges = []
-        
-        print(f"Geoapify API response: {data}")
+        alt_data = geoapify_get("geoapify_alternative", alt_params)
+    except Exception as alt_e:
+        log.warning("Alternative search failed: %s", alt_e)
+        raise
+    log.debug("Alternative search response: %s", alt_data)
+    
+    features = []
+    for feature in alt_data.get('features') or []:
+        properties = feature.get('properties', {})
+        # Look for educational keywords in name or categories
+        name = properties.get('name', '').lower()
+        categories = [cat.lower() for cat in properties.get('categories', [])]
         
-        if 'features' in data and data['features']:
-            for feature in data['features']:
-                properties = feature.get('properties', {})
-                # Only include actual educational institutions
-                if any(cat in ['education', 'university', 'college', 'school'] for cat in properties.get('categories', [])):
-                    colleges.append({
-                        'name': properties.get('name', 'Unknown'),
-                        'address': properties.get('formatted', properties.get('address_line2', '')),
-                        'website': properties.get('website', ''),
-                        'phone': properties.get('phone', ''),
-                        'distance': properties.get('distance', 0) / 1000,  # Convert to km
-                        'categories': properties.get('categories', [])
-                    })
-        else:
-            print("No features found in Geoapify response, trying alternative search...")
-            # Try alternative search with different parameters
-            alt_params = {
-                'text': 'university college school education',
-                'filter': f'circle:{longitude},{latitude},{radius_km * 1000}',
-                'limit': limit,
-                'apiKey': GEOAPIFY_API_KEY,
-                'lang': 'en'
-            }
-            
+        if any(keyword in name for keyword in EDUCATION_KEYWORDS) or \
+           any(cat in EDUCATION_CATEGORIES for cat in categories):
+            features.append(feature)
+    return features
+
+
+def fetch_geoapify_features(latitude, longitude, radius_km, limit):
+    """
+    Educational place features around a point from Geoapify.
+    Runs the category search first and the text search if that comes back empty,
+    or both at once when GEOAPIFY_PARALLEL_SEARCH is enabled.
+    """
+    if GEOAPIFY_PARALLEL_SEARCH:
+        return fetch_geoapify_features_parallel(latitude, longitude, radius_km, limit)
+    
+    features = query_geoapify_primary(latitude, longitude, radius_km, limit)
+    if features is not None:
+        return features
+    log.info("No features found in Geoapify response, trying alternative search")
+    return query_geoapify_alternative(latitude, longitude, radius_km, limit)
+
+
+def merge_features(merged, features, seen_ids, seen_names):
+    """Append features not already present by place id or name"""
+    for feature in features:
+        properties = feature.get('properties', {})
+        place_id = properties.get('place_id')
+        name = properties.get('name', '').strip().casefold()
+        if (place_id and place_id in seen_ids) or (name and name in seen_names):
+            continue
+        if place_id:
+            seen_ids.add(place_id)
+        if name:
+            seen_names.add(name)
+        merged.append(feature)
+
+
+def fetch_geoapify_features_parallel(latitude, longitude, radius_km, limit):
+    """
+    Send the category and text searches together and merge what comes back.
+
+    Returns as soon as the merged, deduplicated features reach
+    GEOAPIFY_ENOUGH_RESULTS (default: limit) or GEOAPIFY_SEARCH_DEADLINE
+    passes; the slower query is cancelled or its result ignored.
+    """
+    enough = GEOAPIFY_ENOUGH_RESULTS or limit
+    futures = {
+        submit_in_context(geo_search_executor, query_geoapify_primary, latitude, longitude, radius_km, limit): 'primary',
+        submit_in_context(geo_search_executor, query_geoapify_alternative, latitude, longitude, radius_km, limit): 'alternative'
+    }
+    merged, seen_ids, seen_names = [], set(), set()
+    errors = []
+    pending = set(futures)
+    deadline = time.monotonic() + GEOAPIFY_SEARCH_DEADLINE
+    
+    while pending and len(merged) < enough:
+        done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            log.warning("Geoapify search deadline of %ss reached", GEOAPIFY_SEARCH_DEADLINE)
+            break
+        for future in done:
             try:
-                alt_response = requests.get(url, params=alt_params, timeout=10)
-                alt_response.raise_for_status()
-                alt_data = alt_response.json()
-                print(f"Alternative search response: {alt_data}")
-                
-                if 'features' in alt_data and alt_data['features']:
-                    for feature in alt_data['features']:
-                        properties = feature.get('properties', {})
-                        # Look for educational keywords in name or categories
-                        name = properties.get('name', '').lower()
-                        categories = [cat.lower() for cat in properties.get('categories', [])]
-                        
-                        if any(keyword in name for keyword in ['university', 'college', 'school', 'institute', 'academy']) or \
-                           any(cat in ['education', 'university', 'college', 'school'] for cat in categories):
-                            colleges.append({
-                                'name': properties.get('name', 'Unknown'),
-                                'address': properties.get('formatted', properties.get('address_line2', '')),
-                                'website': properties.get('website', ''),
-                                'phone': properties.get('phone', ''),
-                                'distance': properties.get('distance', 0) / 1000,
-                                'categories': properties.get('categories', [])
-                            })
-            except Exception as alt_e:
-                print(f"Alternative search also failed: {alt_e}")
+                merge_features(merged, future.result() or [], seen_ids, seen_names)
+            except Exception as e:
+                log.warning("Geoapify %s search failed: %s", futures[future], e)
+                errors.append(e)
+    
+    for future in pending:
+        future.cancel()
+    
+    log.debug("Parallel Geoapify search merged %d features", len(merged))
+    if not merged and errors:
+        raise errors[0]
+    if not merged and pending:
+        raise requests.exceptions.Timeout("Geoapify searches did not finish before the deadline")
+    return merged
+
+
+def colleges_from_features(features, latitude, longitude, radius_km, limit, tags=None):
+    """
+    College dicts for Geoapify features, with distances measured from the
+    user's location, nearest first or best course match first when tags are given
+    """
+    located = []
+    for feature in features:
+        properties = feature.get('properties', {})
+        coordinates = (feature.get('geometry') or {}).get('coordinates') or [None, None]
+        lat = properties.get('lat', coordinates[1])
+        lon = properties.get('lon', coordinates[0])
+        if lat is not None and lon is not None:
+            located.append((properties, lat, lon))
+    if not located:
+        return []
+    
+    distances = haversine_one_to_many(
+        latitude, longitude,
+        [lat for _, lat, _ in located],
+        [lon for _, _, lon in located]
+    )
+    
+    colleges = []
+    for (properties, _, _), distance in zip(located, distances):
+        if distance <= radius_km:
+            colleges.append({
+                'name': properties.get('name', 'Unknown'),
+                'address': properties.get('formatted', properties.get('address_line2', '')),
+                'website': properties.get('website', ''),
+                'phone': properties.get('phone', ''),
+                'distance': float(distance),
+                'categories': properties.get('categories', [])
+            })
+    colleges.sort(key=lambda college: college['distance'])
+    return rank_colleges(colleges, tags)[:limit]
+
+
+def find_nearby_colleges(latitude, longitude, radius_km=30, limit=10, tags=None):
+    """
+    Find nearby educational institutions using Geoapify API.
+    With course tags, colleges matching more of them are ranked first.
+    """
+    if not GEOAPIFY_API_KEY:
+        log.debug("GEOAPIFY_API_KEY not set, using fallback system")
+        FALLBACKS.inc("no_api_key")
+        return get_fallback_colleges(latitude, longitude, radius_km, tags, limit)
+    
+    try:
+        # Results are cached per location tile; the tile-centered search is
+        # widened so it covers the radius around any point inside the tile
+        tile_deg = geo_tile_cache.tile_deg
+        tile = tile_for(latitude, longitude, tile_deg)
+        center_lat, center_lon = tile_center(tile, tile_deg)
+        search_radius_km = radius_km + tile_half_diagonal_km(tile, tile_deg)
+        # Some of the wider search falls outside the user's radius, so ask
+        # for proportionally more places to still end up with limit of them
+        fetch_limit = min(ceil(limit * (search_radius_km / radius_km) ** 2), GEOAPIFY_MAX_LIMIT)
+        # Concurrent misses for the same tile share one upstream search
+        tile_key = (tile, radius_km, limit)
+        features = geo_tile_cache.get_or_fetch(
+            tile_key,
+            lambda: geoapify_flight.do(
+                tile_key, lambda: fetch_geoapify_features(center_lat, center_lon, search_radius_km, fetch_limit)
+            )
+        )
+        colleges = colleges_from_features(features, latitude, longitude, radius_km, limit, tags)
         
-        print(f"Found {len(colleges)} nearby colleges")
+        log.debug("Found %d nearby colleges", len(colleges))
         
         # If no colleges found, provide some popular Indian colleges as fallback
         if len(colleges) == 0:
-            print("No colleges found via Geoapify, providing fallback data...")
-            colleges = get_fallback_colleges(latitude, longitude, radius_km)
-            print(f"Fallback returned {len(colleges)} colleges")
+            log.info("No colleges found via Geoapify, providing fallback data")
+            FALLBACKS.inc("no_results")
+            colleges = get_fallback_colleges(latitude, longitude, radius_km, tags, limit)
+            log.debug("Fallback returned %d colleges", len(colleges))
         
         return colleges
         
+    except CircuitOpenError:
+        log.debug("Geoapify circuit is open, using fallback system")
+        FALLBACKS.inc("circuit_open")
+        return get_fallback_colleges(latitude, longitude, radius_km, tags, limit)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching colleges from Geoapify: {e}")
+        log.warning("Error fetching colleges from Geoapify: %s", e)
+        FALLBACKS.inc("upstream_error")
         # Return fallback colleges on API error
-        return get_fallback_colleges(latitude, longitude, radius_km)
-    except Exception as e:
-        print(f"Unexpected error in find_nearby_colleges: {e}")
-        return get_fallback_colleges(latitude, longitude, radius_km)
-
-
-def get_fallback_colleges(latitude, longitude, radius_km=30):
-    """Fallback colleges data for when Geoapify API fails"""
-    # Popular Indian colleges with their coordinates - covering major cities
-    fallback_colleges = [
-        # Mumbai colleges
-        {
-            'name': 'Indian Institute of Technology Bombay',
-            'address': 'Powai, Mumbai, Maharashtra 400076',
-            'website': 'https://www.iitb.ac.in',
-            'phone': '+91-22-2572-2545',
-            'lat': 19.1334,
-            'lon': 72.9133,
-            'categories': ['university', 'education', 'engineering']
-        },
-        {
-            'name': 'University of Mumbai',
-            'address': 'Kalina, Santacruz East, Mumbai, Maharashtra 400098',
-            'website': 'https://mu.ac.in',
-            'phone': '+91-22-2652-3000',
-            'lat': 19.0760,
-            'lon': 72.8777,
-            'categories': ['university', 'education']
-        },
-        {
-            'name': 'St. Xavier\'s College',
-            'address': 'Mahapalika Marg, Dhobi Talao, Mumbai, Maharashtra 400001',
-            'website': 'https://xaviers.edu',
-            'phone': '+91-22-2262-1300',
-            'lat': 18.9368,
-            'lon': 72.8276,
-            'categories': ['college', 'education', 'arts']
-        },
-        # Delhi colleges
-        {
-            'name': 'Delhi University',
-            'address': 'North Campus, Delhi 110007',
-            'website': 'https://du.ac.in',
-            'phone': '+91-11-2766-7777',
-            'lat': 28.6892,
-            'lon': 77.2090,
-            'categories': ['university', 'education']
-        },
-        {
-            'name': 'Indian Institute of Technology Delhi',
-            'address': 'Hauz Khas, New Delhi 110016',
-            'website': 'https://home.iitd.ac.in',
-            'phone': '+91-11-2659-7135',
-            'lat': 28.5455,
-            'lon': 77.1923,
-            'categories': ['university', 'education', 'engineering']
-        },
-        {
-            'name': 'AIIMS Delhi',
-            'address': 'Ansari Nagar, New Delhi 110029',
-            'website': 'https://www.aiims.edu',
-            'phone': '+91-11-2658-8500',
-            'lat': 28.5665,
-            'lon': 77.2100,
-            'categories': ['university', 'education', 'medicine']
-        },
-        {
-            'name': 'Jawaharlal Nehru University',
-            'address': 'New Mehrauli Road, New Delhi 110067',
-            'website': 'https://www.jnu.ac.in',
-            'phone': '+91-11-2670-4100',
-            'lat': 28.5402,
-            'lon': 77.1660,
-            'categories': ['university', 'education']
-        },
-        # Hyderabad colleges
-        {
-            'name': 'Indian Institute of Technology Hyderabad',
-            'address': 'Kandi, Sangareddy, Telangana 502285',
-            'website': 'https://iith.ac.in',
-            'phone': '+91-40-2301-6032',
-            'lat': 17.5926,
-            'lon': 78.1271,
-            'categories': ['university', 'education', 'engineering']
-        },
-        {
-            'name': 'University of Hyderabad',
-            'address': 'Gachibowli, Hyderabad, Telangana 500046',
-            'website': 'https://uohyd.ac.in',
-            'phone': '+91-40-2313-2000',
-            'lat': 17.4590,
-            'lon': 78.3480,
-            'categories': ['university', 'education']
-        },
-        {
-            'name': 'Osmania University',
-            'address': 'Osmania University, Hyderabad, Telangana 500007',
-            'website': 'https://osmania.ac.in',
-            'phone': '+91-40-2768-2222',
-            'lat': 17.4065,
-            'lon': 78.4772,
-            'categories': ['university', 'education']
-        },
-        {
-            'name': 'NALSAR University of Law',
-            'address': 'Justice City, Shamirpet, Hyderabad, Telangana 500101',
-            'website': 'https://www.nalsar.ac.in',
-            'phone': '+91-40-2349-8100',
-            'lat': 17.5123,
-            'lon': 78.4567,
-            'categories': ['university', 'education', 'law']
-        },
-        # Bangalore colleges
-        {
-            'name': 'Indian Institute of Science Bangalore',
-            'address': 'C.V. Raman Ave, Bengaluru, Karnataka 560012',
-            'website': 'https://www.iisc.ac.in',
-            'phone': '+91-80-2293-2000',
-            'lat': 12.9914,
-            'lon': 77.5921,
-            'categories': ['university', 'education', 'science']
-        },
-        {
-            'name': 'Indian Institute of Management Bangalore',
-            'address': 'Bannerghatta Road, Bengaluru, Karnataka 560076',
-            'website': 'https://www.iimb.ac.in',
-            'phone': '+91-80-2699-3000',
-            'lat': 12.8914,
-            'lon': 77.6010,
-            'categories': ['university', 'education', 'management']
-        },
-        {
-            'name': 'Bangalore University',
-            'address': 'Jnana Bharathi, Bengaluru, Karnataka 560056',
-            'website': 'https://bangaloreuniversity.ac.in',
-            'phone': '+91-80-2321-0101',
-            'lat': 12.8567,
-            'lon': 77.5049,
-            'categories': ['university', 'education']
-        },
-        # Chennai colleges
-        {
-            'name': 'Indian Institute of Technology Madras',
-            'address': 'IIT P.O., Chennai, Tamil Nadu 600036',
-            'website': 'https://www.iitm.ac.in',
-            'phone': '+91-44-2257-8000',
-            'lat': 12.9914,
-            'lon': 80.2337,
-            'categories': ['university', 'education', 'engineering']
-        },
-        {
-            'name': 'Anna University',
-            'address': 'Sardar Patel Rd, Guindy, Chennai, Tamil Nadu 600025',
-            'website': 'https://www.annauniv.edu',
-            'phone': '+91-44-2235-1777',
-            'lat': 12.9850,
-            'lon': 80.2177,
-            'categories': ['university', 'education', 'engineering']
-        },
-        # Pune colleges
-        {
-            'name': 'Indian Institute of Science Education and Research Pune',
-            'address': 'Dr. Homi Bhabha Road, Pune, Maharashtra 411008',
-            'website': 'https://www.iiserpune.ac.in',
-            'phone': '+91-20-2590-8000',
-            'lat': 18.5474,
-            'lon': 73.8164,
-            'categories': ['university', 'education', 'science']
-        },
-        {
-            'name': 'University of Pune',
-            'address': 'Ganeshkhind, Pune, Maharashtra 411007',
-            'website': 'https://www.unipune.ac.in',
-            'phone': '+91-20-2569-0000',
-            'lat': 18.5522,
-            'lon': 73.8267,
-            'categories': ['university', 'education']
-        },
-        # Kolkata colleges
-        {
-            'name': 'Indian Institute of Technology Kharagpur',
-            'address': 'Kharagpur, West Bengal 721302',
-            'website': 'https://www.iitkgp.ac.in',
-            'phone': '+91-3222-255-221',
-            'lat': 22.3149,
-            'lon': 87.3105,
-            'categories': ['university', 'education', 'engineering']
-        },
-        {
-            'name': 'University of Calcutta',
-            'address': 'Senate House, 87/1, College Street, Kolkata, West Bengal 700073',
-            'website': 'https://www.caluniv.ac.in',
-            'phone': '+91-33-2241-0071',
-            'lat': 22.5726,
-            'lon': 88.3639,
-            'categories': ['university', 'education']
-        },
-        # Vellore colleges
-        {
-            'name': 'Vellore Institute of Technology',
-            'address': 'Vellore, Tamil Nadu 632014',
-            'website': 'https://vit.ac.in',
-            'phone': '+91-416-220-2000',
-            'lat': 12.9692,
-            'lon': 79.1559,
-            'categories': ['university', 'education', 'engineering']
-        }
-    ]
-    
-    # Calculate distance and filter by radius
-    def haversine_distance(lat1, lon1, lat2, lon2):
-        from math import radians, cos, sin, asin, sqrt
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        return c * r
-    
+        return get_fallback_colleges(latitude, longitude, radius_km, tags, limit)
+    except Exception:
+        log.exception("Unexpected error in find_nearby_colleges")
+        FALLBACKS.inc("error")
+        return get_fallback_colleges(latitude, longitude, radius_km, tags, limit)
+
+
+def get_fallback_colleges(latitude, longitude, radius_km=30, tags=None, limit=None):
+    """
+    Fallback colleges data for when Geoapify API fails.
+    All colleges within the radius in catalog order, or with tags or a
+    limit, the best course matches first and then the nearest.
+    """
     nearby_colleges = []
-    print(f"Checking {len(fallback_colleges)} fallback colleges within {radius_km}km of {latitude}, {longitude}")
+    college_index = get_college_index()
+    log.debug("Checking %d fallback colleges within %skm of %s, %s", len(college_index), radius_km, latitude, longitude)
     
-    for college in fallback_colleges:
-        distance = haversine_distance(latitude, longitude, college['lat'], college['lon'])
-        print(f"College: {college['name']}, Distance: {distance:.1f}km")
-        if distance <= radius_km:
+    # Only colleges in grid cells overlapping the radius (or in the wanted
+    # categories) are measured
+    with stage(STAGE_SECONDS, "fallback_scan"):
+        if tags or limit is not None:
+            matches = college_index.ranked_within(latitude, longitude, radius_km, tags or (), limit)
+        else:
+            matches = ((college, distance, None) for college, distance in college_index.within_radius(latitude, longitude, radius_km))
+        for college, distance, course_match in matches:
+            log.debug("Fallback college %s at %.1fkm", college['name'], distance)
             college_copy = college.copy()
             college_copy['distance'] = distance
+            if tags:
+                college_copy['course_match'] = course_match
             del college_copy['lat']
             del college_copy['lon']
             nearby_colleges.append(college_copy)
-            print(f"Added {college['name']} to nearby colleges")
-        else:
-            print(f"Skipped {college['name']} - too far ({distance:.1f}km > {radius_km}km)")
     
-    print(f"Fallback system found {len(nearby_colleges)} colleges within {radius_km}km")
+    log.debug("Fallback system found %d colleges within %skm", len(nearby_colleges), radius_km)
     return nearby_colleges
 
 
+def nearby_colleges_for(user_location, tags=None):
+    """Find nearby colleges if location is provided, ranked by course tags if given"""
+    log.debug("User location data: %s", user_location)
+    if user_location and 'latitude' in user_location and 'longitude' in user_location:
+        nearby_colleges = find_nearby_colleges(
+            user_location['latitude'], 
+            user_location['longitude'],
+            tags=tags
+        )
+        log.debug("Main endpoint found %d nearby colleges", len(nearby_colleges))
+        return nearby_colleges
+    log.debug("No valid location provided, skipping nearby colleges search")
+    return []
+
+
+def remaining_time(started, timeout):
+    """Seconds left of a stage deadline measured from started"""
+    return max(timeout - (time.monotonic() - started), 0)
+
+
 @app.route("/recommend", methods=["POST"])
 def recommend():
     try:
@@ -375,8 +554,89 @@ def recommend():
         if not answers:
             return jsonify({"error": "No answers provided"}), 400
 
-        # Create a more structured prompt asking for JSON output
-        prompt = f"""
+        cache_key = make_cache_key(answers)
+        
+        # With the rules engine fixed-bank answers are scored locally; anything
+        # else goes to the cache and Gemini
+        started = time.monotonic()
+        result = local_recommendations(answers) or lookup_cached(cache_key, answers)
+        
+        # Gemini and the college lookup don't depend on each other, so run
+        # them side by side and return whatever finished within its deadline.
+        # Courses already known are used to rank the colleges in the lookup.
+        tags = course_tags(result["courses"]) if result is not None else None
+        colleges_future = submit_in_context(stage_executor, nearby_colleges_for, user_location, tags)
+        timed_out = []
+        
+        if result is not None:
+            log.debug("Serving recommendations without a model call")
+        else:
+            # When enriching, Gemini only gets until the shorter deadline
+            # before the rule-based result is served instead
+            baseline = enrichment_baseline(answers)
+            model_timeout = ENRICH_TIMEOUT if baseline is not None else MODEL_STAGE_TIMEOUT
+            # Identical answers already waiting on Gemini share that call
+            model_future = submit_in_context(stage_executor, model_flight.do, cache_key, lambda: generate_recommendations(answers))
+            try:
+                result = model_future.result(timeout=remaining_time(started, model_timeout))
+                store_cached(cache_key, answers, result)
+            except FuturesTimeoutError:
+                log.warning("Gemini stage timed out after %ss", model_timeout)
+                UPSTREAM_ERRORS.inc("gemini", "stage_timeout")
+                # A late answer still serves the next identical request
+                model_future.add_done_callback(lambda future: store_late_result(cache_key, answers, future))
+                if baseline is not None:
+                    result = baseline
+                else:
+                    timed_out.append("recommendations")
+                    result = {"recommendations": [], "courses": []}
+            except PromptBudgetError as e:
+                result = over_budget_recommendations(answers, e)
+                if result is None:
+                    return jsonify({"error": str(e)}), 413
+            except CircuitOpenError:
+                log.debug("Gemini circuit is open, serving degraded recommendations")
+                result = degraded_recommendations(answers)
+            except Exception as e:
+                if baseline is not None:
+                    log.warning("Gemini enrichment failed, serving rule-based recommendations: %s", e)
+                    result = baseline
+                elif isinstance(e, ValueError):
+                    return jsonify({"error": "Failed to parse JSON from AI response: " + str(e)}), 500
+                else:
+                    raise
+        
+        try:
+            nearby_colleges = colleges_future.result(timeout=remaining_time(started, COLLEGES_STAGE_TIMEOUT))
+        except FuturesTimeoutError:
+            log.warning("College lookup stage timed out after %ss", COLLEGES_STAGE_TIMEOUT)
+            UPSTREAM_ERRORS.inc("geoapify", "stage_timeout")
+            timed_out.append("nearby_colleges")
+            nearby_colleges = []
+        if tags is None:
+            # The lookup ran before Gemini answered, so rank what it found
+            nearby_colleges = rank_colleges(nearby_colleges, course_tags(result.get("courses")))
+        
+        response = {
+            "recommendations": result.get("recommendations", []),
+            "courses": result.get("courses", []),
+            "nearby_colleges": nearby_colleges
+        }
+        if result.get("partial"):
+            response["partial"] = True
+        if result.get("degraded"):
+            response["degraded"] = True
+        if timed_out:
+            response["timed_out"] = timed_out
+        return jsonify(response)
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def build_prompt(answers):
+    """Create a more structured prompt asking for JSON output (the legacy PROMPT_STYLE)"""
+    return f"""
         You are a career counselor for Indian students. Based on the following quiz answers, recommend career paths and related courses.Using RIASEC model suggest careers.
         Quiz Answers: {json.dumps(answers)}
 
@@ -445,40 +705,417 @@ def recommend():
         }}
         """
 
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
-        
-        # Parse the JSON response from the model
+
+def parse_model_response(text):
+    """
+    Parse the JSON response from the model into recommendations and courses.
+
+    Stray text around the JSON and trailing commas are tolerated. When the
+    output was truncated, whatever items were complete are returned with
+    "partial" set. Raises ValueError if nothing usable can be recovered.
+    """
+    try:
+        data, status = parse_model_json(text)
+        result = validate_recommendations(data)
+        if not result["recommendations"] and not result["courses"]:
+            raise ValueError("Model response has no valid recommendations or courses")
+    except ValueError:
+        parse_stats.record('failed')
+        raise
+    parse_stats.record(status)
+    if status == 'partial':
+        result["partial"] = True
+    return result
+
+
+def local_recommendations(answers):
+    """Rule-based RIASEC result when enabled and every answer is from the question bank"""
+    if RECOMMEND_ENGINE != "rules":
+        return None
+    return riasec.recommend(answers)
+
+
+def enrichment_baseline(answers):
+    """
+    Rule-based result to serve if Gemini can't enrich it in time, when
+    enriching and every answer is from the question bank
+    """
+    if RECOMMEND_ENGINE != "enrich":
+        return None
+    return riasec.recommend(answers)
+
+
+def degraded_recommendations(answers):
+    """
+    Result while the Gemini circuit is open: the rule-based one from the
+    answers that are in the question bank, else empty. Never cached.
+    """
+    result = riasec.recommend(answers, skip_unknown=True) or {"recommendations": [], "courses": []}
+    result["degraded"] = True
+    return result
+
+
+def model_request(answers):
+    """Prompt and generation config for the configured PROMPT_STYLE"""
+    if PROMPT_STYLE == "legacy":
+        return build_prompt(answers), None
+    return build_compact_prompt(answers, PROMPT_TOKEN_BUDGET), GENERATION_CONFIG
+
+
+def generate_recommendations(answers):
+    """Ask Gemini for career recommendations and courses for the quiz answers"""
+    with stage(STAGE_SECONDS, "prompt_build"):
+        prompt, generation_config = model_request(answers)
+    error = None
+    for attempt in range(MODEL_PARSE_RETRIES + 1):
+        if attempt:
+            # Output that can't be parsed at all is worth one more try
+            parse_stats.record('reinvocations')
+            log.warning("Re-invoking Gemini after unparseable output: %s", error)
+        with stage(STAGE_SECONDS, "gemini_call"):
+            try:
+                response = gemini_breaker.call(lambda: gemini_hedger.call(
+                    lambda: get_model().generate_content(
+                        prompt, generation_config=generation_config,
+                        request_options={"timeout": GEMINI_CALL_TIMEOUT}
+                    )
+                ))
+                text = response.text
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                UPSTREAM_ERRORS.inc("gemini", type(e).__name__)
+                raise
         try:
-            # The model's response text might need some cleaning
-            json_text = response.text.replace('```json', '').replace('```', '').strip()
-            data = json.loads(json_text)
-            
-            # Find nearby colleges if location is provided
-            nearby_colleges = []
-            print(f"User location data: {user_location}")
-            if user_location and 'latitude' in user_location and 'longitude' in user_location:
-                print(f"Calling find_nearby_colleges with: {user_location['latitude']}, {user_location['longitude']}")
-                nearby_colleges = find_nearby_colleges(
-                    user_location['latitude'], 
-                    user_location['longitude']
-                )
-                print(f"Main endpoint found {len(nearby_colleges)} nearby colleges")
+            with stage(STAGE_SECONDS, "json_parse"):
+                return parse_model_response(text)
+        except ValueError as e:
+            UPSTREAM_ERRORS.inc("gemini", "unparseable")
+            error = e
+    raise error
+
+
+def cached_recommendations(answers, throttle=None):
+    """
+    generate_recommendations() behind the rule-based fast path and the
+    response cache. throttle, if given, is called right before the model call.
+    """
+    result = local_recommendations(answers)
+    if result is not None:
+        return result
+    cache_key = make_cache_key(answers)
+    result = lookup_cached(cache_key, answers)
+    if result is None:
+        baseline = enrichment_baseline(answers)
+        try:
+            if baseline is None:
+                result = model_flight.do(cache_key, lambda: call_model(answers, throttle))
             else:
-                print("No valid location provided, skipping nearby colleges search")
-            
-            # Extract the recommendations and courses and return them
-            return jsonify({
-                "recommendations": data.get("recommendations", []),
-                "courses": data.get("courses", []),
-                "nearby_colleges": nearby_colleges
-            })
-        
-        except json.JSONDecodeError as e:
-            return jsonify({"error": "Failed to parse JSON from AI response: " + str(e)}), 500
-            
+                # Same deadline as /recommend, not counting the rate limit
+                if throttle is not None:
+                    throttle()
+                model_future = submit_in_context(stage_executor, model_flight.do, cache_key, lambda: generate_recommendations(answers))
+                try:
+                    result = model_future.result(timeout=ENRICH_TIMEOUT)
+                except FuturesTimeoutError:
+                    log.warning("Gemini stage timed out after %ss, using rule-based recommendations", ENRICH_TIMEOUT)
+                    UPSTREAM_ERRORS.inc("gemini", "stage_timeout")
+                    model_future.add_done_callback(lambda future: store_late_result(cache_key, answers, future))
+                    return baseline
+        except PromptBudgetError as e:
+            result = over_budget_recommendations(answers, e)
+            if result is None:
+                raise
+            return result
+        except CircuitOpenError:
+            return degraded_recommendations(answers)
+        except Exception as e:
+            if baseline is None:
+                raise
+            log.warning("Gemini enrichment failed, using rule-based recommendations: %s", e)
+            return baseline
+        store_cached(cache_key, answers, result)
+    return result
+
+
+def call_model(answers, throttle=None):
+    """generate_recommendations(), after waiting on throttle when given"""
+    if throttle is not None:
+        throttle()
+    return generate_recommendations(answers)
+
+
+def over_budget_recommendations(answers, error):
+    """
+    Rule-based result from the question-bank answers when the prompt is over
+    PROMPT_TOKEN_BUDGET, else None
+    """
+    log.warning("%s, using rule-based recommendations", error)
+    return riasec.recommend(answers, skip_unknown=True)
+
+
+def lookup_cached(cache_key, answers):
+    """Cached model response for an identical answer set, else a near-duplicate one"""
+    result = response_cache.get(cache_key)
+    if result is None and semantic_cache is not None:
+        result = semantic_cache.get(answers)
+        if result is not None:
+            log.debug("Serving recommendations from semantic cache")
+    return result
+
+
+def store_late_result(cache_key, answers, future):
+    """Done callback caching a model result that arrived after its deadline"""
+    if not future.cancelled() and future.exception() is None:
+        store_cached(cache_key, answers, future.result())
+
+
+def store_cached(cache_key, answers, result):
+    """Remember a model response in both the exact and semantic caches"""
+    if result.get("partial"):
+        return  # let the next request try for a complete answer
+    response_cache.set(cache_key, result)
+    if semantic_cache is not None:
+        semantic_cache.set(cache_key, answers, result)
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_model_items(prompt, generation_config, events, stop, cache_key, answers):
+    """
+    Stream a Gemini response, putting ("item", (key, item)) on events for
+    each complete recommendation or course, then ("done", result) once the
+    whole response is parsed and cached, or ("error", exception). Once stop
+    is set it quits at the next chunk without giving the breaker a verdict.
+    """
+    parser = StreamingArrayParser()
+    started = time.monotonic()
+    try:
+        with stage(STAGE_SECONDS, "gemini_stream"):
+            chunks = get_model().generate_content(
+                prompt, generation_config=generation_config, stream=True,
+                request_options={"timeout": GEMINI_CALL_TIMEOUT}
+            )
+            for chunk in chunks:
+                if stop.is_set():
+                    gemini_breaker.abandon()
+                    return
+                for key, item in parser.feed(chunk.text):
+                    if matches_schema(item, RECOMMENDATION_SCHEMA['properties'][key]['items']):
+                        events.put(("item", (key, item)))
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        gemini_breaker.record(False, time.monotonic() - started)
+        events.put(("error", e))
+        return
+    gemini_breaker.record(True, time.monotonic() - started)
+    try:
+        with stage(STAGE_SECONDS, "json_parse"):
+            parsed = parse_model_response(parser.text)
+    except ValueError as e:
+        events.put(("error", e))
+        return
+    # Cached even if the client stopped waiting for it
+    store_cached(cache_key, answers, parsed)
+    events.put(("done", parsed))
+
+
+@app.route("/recommend/stream", methods=["POST"])
+def recommend_stream():
+    """
+    Streaming variant of /recommend using Server-Sent Events.
+
+    Emits a recommendation or course event for each item as soon as Gemini
+    has generated it, a nearby_colleges event when the lookup finishes (sent
+    again, ranked by the courses, if it went out before they were known),
+    and a final done (or error) event.
+    """
+    data = request.get_json() or {}
+    answers = data.get('answers', {})
+    user_location = data.get('location', {})  # {latitude, longitude}
+    
+    if not answers:
+        return jsonify({"error": "No answers provided"}), 400
+    
+    cache_key = make_cache_key(answers)
+    started = time.monotonic()
+    result = local_recommendations(answers) or lookup_cached(cache_key, answers)
+    baseline = enrichment_baseline(answers) if result is None else None
+    tags = course_tags(result["courses"]) if result is not None else None
+    colleges_future = submit_in_context(stage_executor, nearby_colleges_for, user_location, tags)
+    event_names = {"recommendations": "recommendation", "courses": "course"}
+    # Courses streamed so far, to rank colleges by when the lookup couldn't
+    sent_courses = []
+    
+    def item_event(key, item):
+        if key == "courses":
+            sent_courses.append(item)
+        return sse_event(event_names[key], item)
+    
+    def item_events(items):
+        for key in event_names:
+            for item in items.get(key, []):
+                yield item_event(key, item)
+    
+    def colleges_event():
+        try:
+            nearby_colleges = colleges_future.result(timeout=remaining_time(started, COLLEGES_STAGE_TIMEOUT))
+        except FuturesTimeoutError:
+            log.warning("College lookup stage timed out after %ss", COLLEGES_STAGE_TIMEOUT)
+            UPSTREAM_ERRORS.inc("geoapify", "stage_timeout")
+            return sse_event("nearby_colleges", {"nearby_colleges": [], "timed_out": True})
+        except Exception as e:
+            log.warning("College lookup stage failed: %s", e)
+            return sse_event("nearby_colleges", {"nearby_colleges": []})
+        if tags is None:
+            nearby_colleges = rank_colleges(nearby_colleges, course_tags(sent_courses))
+        return sse_event("nearby_colleges", {"nearby_colleges": nearby_colleges})
+    
+    def generate():
+        colleges_sent = False
+        if result is not None:
+            log.debug("Streaming recommendations without a model call")
+            yield from item_events(result)
+        else:
+            # Gemini is read on a worker thread so whichever of its items and
+            # the college lookup is ready first goes out first
+            events = queue.SimpleQueue()
+            colleges_future.add_done_callback(lambda _: events.put(("colleges", None)))
+            stop = threading.Event()
+            items_sent = 0
+            # When enriching, the rule-based result goes out instead if
+            # Gemini has sent nothing by the deadline; Gemini keeps going so
+            # its answer is cached for next time
+            deadline = started + ENRICH_TIMEOUT if baseline is not None else None
+            detached = False
+            try:
+                with stage(STAGE_SECONDS, "prompt_build"):
+                    prompt, generation_config = model_request(answers)
+                # Streams can't be hedged, but they still feed the breaker
+                gemini_breaker.before_call()
+                submit_in_context(stage_executor, stream_model_items, prompt, generation_config, events, stop, cache_key, answers)
+                while True:
+                    wait_for = max(deadline - time.monotonic(), 0) if deadline is not None and not items_sent else None
+                    try:
+                        kind, value = events.get(timeout=wait_for)
+                    except queue.Empty:
+                        log.warning("Gemini sent nothing within %ss, streaming rule-based recommendations", ENRICH_TIMEOUT)
+                        UPSTREAM_ERRORS.inc("gemini", "stage_timeout")
+                        detached = True
+                        yield from item_events(baseline)
+                        break
+                    if kind == "colleges":
+                        if not colleges_sent:
+                            colleges_sent = True
+                            yield colleges_event()
+                    elif kind == "item":
+                        items_sent += 1
+                        yield item_event(*value)
+                    elif kind == "error":
+                        raise value
+                    else:
+                        break
+            except CircuitOpenError:
+                log.debug("Gemini circuit is open, streaming degraded recommendations")
+                yield from item_events(degraded_recommendations(answers))
+                yield sse_event("degraded", {})
+            except PromptBudgetError as e:
+                over_budget = over_budget_recommendations(answers, e)
+                if over_budget is None:
+                    yield sse_event("error", {"error": str(e)})
+                else:
+                    yield from item_events(over_budget)
+            except Exception as e:
+                UPSTREAM_ERRORS.inc("gemini", "unparseable" if isinstance(e, ValueError) else type(e).__name__)
+                if baseline is not None and not items_sent:
+                    log.warning("Gemini enrichment failed, streaming rule-based recommendations: %s", e)
+                    yield from item_events(baseline)
+                elif isinstance(e, ValueError):
+                    yield sse_event("error", {"error": "Failed to parse JSON from AI response: " + str(e)})
+                else:
+                    yield sse_event("error", {"error": str(e)})
+            finally:
+                # Also runs if the client disconnects mid-stream
+                if not detached:
+                    stop.set()
+        
+        if not colleges_sent:
+            yield colleges_event()
+        elif tags is None and sent_courses and colleges_future.done() and colleges_future.exception() is None:
+            # Sent before the courses were known: replace them, ranked by course
+            yield colleges_event()
+        yield sse_event("done", {})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/recommend/batch", methods=["POST"])
+def recommend_batch():
+    """
+    Recommendations for many students in one request.
+
+    The body is JSONL (one {id, answers, location} object per line) or a JSON
+    object with a "records" list. Results stream back as JSONL in completion
+    order, with an "error" field on records that failed.
+    """
+    if request.is_json:
+        payload = request.get_json() or {}
+        lines = [json.dumps(record) for record in payload.get('records', [])]
+    else:
+        lines = request.get_data(as_text=True).splitlines()
+    
+    records = read_records(lines)
+    if not records:
+        return jsonify({"error": "No records provided"}), 400
+    
+    workers = max(1, min(request.args.get('workers', BATCH_WORKERS, type=int), BATCH_WORKERS))
+    
+    def generate():
+        for result in run_batch(records, cached_recommendations, nearby_colleges_for, workers, BATCH_RATE):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    """Hit/miss counters for the caches, plus how many upstream calls were coalesced"""
+    return jsonify({
+        "responses": response_cache.stats(),
+        "semantic": semantic_cache.stats() if semantic_cache is not None else None,
+        "geo_tiles": geo_tile_cache.stats(),
+        "coalesced": {
+            "model_calls": model_flight.stats(),
+            "geoapify_calls": geoapify_flight.stats()
+        }
+    })
+
+@app.route("/upstream-stats", methods=["GET"])
+def upstream_stats():
+    """Circuit breaker state and hedging counters for each upstream"""
+    return jsonify({
+        "geoapify": {"breaker": geoapify_breaker.stats(), "hedging": geoapify_hedger.stats()},
+        "gemini": {"breaker": gemini_breaker.stats(), "hedging": gemini_hedger.stats()}
+    })
+
+@app.route("/parse-stats", methods=["GET"])
+def parse_stats_endpoint():
+    """How model output parsed, and how often Gemini was re-invoked for unparseable output"""
+    return jsonify(parse_stats.stats())
+
+@app.route("/http-stats", methods=["GET"])
+def http_stats():
+    """Connection pool size and reuse for upstream API calls"""
+    return jsonify(pool_stats())
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Stage latency histograms and cache, fallback and upstream error counters in Prometheus text format"""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route("/test-location", methods=["POST"])
 def test_location():
@@ -491,9 +1128,9 @@ def test_location():
         if not latitude or not longitude:
             return jsonify({"error": "Latitude and longitude required"}), 400
         
-        print(f"Testing location: {latitude}, {longitude}")
+        log.debug("Testing location: %s, %s", latitude, longitude)
         colleges = find_nearby_colleges(latitude, longitude, radius_km=30, limit=10)
-        print(f"Test endpoint returning {len(colleges)} colleges")
+        log.debug("Test endpoint returning %d colleges", len(colleges))
         
         return jsonify({
             "location": {"latitude": latitude, "longitude": longitude},
@@ -501,7 +1138,7 @@ def test_location():
             "count": len(colleges)
         })
     except Exception as e:
-        print(f"Error in test_location: {e}")
+        log.exception("Error in test_location")
         return jsonify({"error": str(e)}), 500
 
 @app.route("/test-fallback", methods=["POST"])
@@ -513,9 +1150,9 @@ def test_fallback():
         longitude = data.get('longitude', 72.8777)
         radius_km = data.get('radius_km', 30)
         
-        print(f"Testing fallback system: {latitude}, {longitude}, radius: {radius_km}km")
+        log.debug("Testing fallback system: %s, %s, radius: %skm", latitude, longitude, radius_km)
         colleges = get_fallback_colleges(latitude, longitude, radius_km)
-        print(f"Fallback test returned {len(colleges)} colleges")
+        log.debug("Fallback test returned %d colleges", len(colleges))
         
         return jsonify({
             "location": {"latitude": latitude, "longitude": longitude},
@@ -524,7 +1161,7 @@ def test_fallback():
             "radius_km": radius_km
         })
     except Exception as e:
-        print(f"Error in test_fallback: {e}")
+        log.exception("Error in test_fallback")
         return jsonify({"error": str(e)}), 500
 
 @app.route("/test-distance", methods=["POST"])
@@ -543,23 +1180,18 @@ def test_distance():
             {"name": "Osmania University", "lat": 17.4065, "lon": 78.4772}
         ]
         
-        def haversine_distance(lat1, lon1, lat2, lon2):
-            from math import radians, cos, sin, asin, sqrt
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            r = 6371  # Radius of earth in kilometers
-            return c * r
+        distances = haversine_one_to_many(
+            user_lat, user_lon,
+            [college['lat'] for college in test_colleges],
+            [college['lon'] for college in test_colleges]
+        )
         
         results = []
-        for college in test_colleges:
-            distance = haversine_distance(user_lat, user_lon, college['lat'], college['lon'])
+        for college, distance in zip(test_colleges, distances):
             results.append({
                 "name": college['name'],
-                "distance_km": round(distance, 1),
-                "within_30km": distance <= 30
+                "distance_km": round(float(distance), 1),
+                "within_30km": bool(distance <= 30)
             })
         
         return jsonify({
@@ -567,8 +1199,9 @@ def test_distance():
             "test_results": results
         })
     except Exception as e:
-        print(f"Error in test_distance: {e}")
+        log.exception("Error in test_distance")
         return jsonify({"error": str(e)}), 500
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(debug=os.getenv("FLASK_DEBUG", "1").lower() in ("1", "true", "yes"))
\ No newline at end of file
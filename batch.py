@@ -0,0 +1,182 @@
+"""
+Batch recommendations for whole classes of quiz results.
+
+Input is JSONL, one student per line:
+    {"id": "s1", "answers": {...}, "location": {"latitude": ..., "longitude": ...}}
+
+Output is JSONL with one result (or per-record error) per input line. Run
+with --resume to skip ids that already have a successful result in the
+output file.
+
+Usage:
+    python batch.py students.jsonl -o results.jsonl --workers 4 --rate 2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from logging_setup import get_logger
+from response_cache import make_cache_key
+
+log = get_logger("batch")
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate_per_second apart across all threads"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def read_records(lines):
+    """Parse JSONL lines into records, giving each an id and reporting bad lines as errors"""
+    records = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("each line must be a JSON object")
+        except ValueError as e:
+            records.append({'id': str(number), 'error': f"Invalid JSON on line {number}: {e}"})
+            continue
+        record.setdefault('id', str(number))
+        records.append(record)
+    return records
+
+
+def completed_ids(path):
+    """Ids with a successful result in an existing output file"""
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # a line cut off by an interrupted run
+            if isinstance(result, dict) and 'error' not in result:
+                done.add(str(result.get('id')))
+    return done
+
+
+def output_ends_with_newline(path):
+    """Whether the last line of a non-empty file is complete"""
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def run_batch(records, recommend, find_colleges, workers=4, rate_per_second=2.0):
+    """
+    Yield one result dict per record as soon as it is ready.
+
+    Identical answer sets are handled once on a bounded worker pool;
+    college lookups run per record on a pool of the same size. recommend is
+    called as recommend(answers, throttle) and must call throttle() right
+    before each model call, so only those are rate-limited and cache hits
+    are not. If the consumer stops early, queued work is cancelled.
+    """
+    limiter = RateLimiter(rate_per_second)
+    groups = {}
+    for record in records:
+        if 'error' in record:
+            yield {'id': record['id'], 'error': record['error']}
+        elif not record.get('answers'):
+            yield {'id': record['id'], 'error': "No answers provided"}
+        else:
+            groups.setdefault(make_cache_key(record['answers']), []).append(record)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    geo_pool = ThreadPoolExecutor(max_workers=workers)
+    abandoned = False
+    try:
+        model_futures = {
+            pool.submit(recommend, group[0]['answers'], limiter.wait): group
+            for group in groups.values()
+        }
+        college_futures = {
+            record['id']: geo_pool.submit(find_colleges, record.get('location') or {})
+            for group in groups.values() for record in group
+        }
+        for future in as_completed(model_futures):
+            group = model_futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                for record in group:
+                    yield {'id': record['id'], 'error': str(e)}
+                continue
+            for record in group:
+                try:
+                    nearby_colleges = college_futures[record['id']].result()
+                except Exception as e:
+                    nearby_colleges = []
+                    log.warning("College lookup failed for %s: %s", record['id'], e)
+                yield {
+                    'id': record['id'],
+                    'recommendations': result.get('recommendations', []),
+                    'courses': result.get('courses', []),
+                    'nearby_colleges': nearby_colleges
+                }
+    except GeneratorExit:
+        abandoned = True
+        raise
+    finally:
+        for executor in (pool, geo_pool):
+            executor.shutdown(wait=not abandoned, cancel_futures=abandoned)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch career recommendations from a JSONL file")
+    parser.add_argument('input', help="JSONL file of {id, answers, location} records")
+    parser.add_argument('-o', '--output', required=True, help="JSONL file to write results to")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent model calls")
+    parser.add_argument('--rate', type=float, default=2.0, help="Max model calls per second (0 for no limit)")
+    parser.add_argument('--resume', action='store_true', help="Skip ids already completed in the output file")
+    args = parser.parse_args(argv)
+
+    # Imported here so --help works without API keys configured
+    from app import cached_recommendations, nearby_colleges_for
+
+    with open(args.input, encoding='utf-8') as f:
+        records = read_records(f)
+
+    done = completed_ids(args.output) if args.resume else set()
+    pending = [record for record in records if str(record['id']) not in done]
+    print(f"{len(records)} records, {len(records) - len(pending)} already done, {len(pending)} to run", file=sys.stderr)
+
+    failed = 0
+    with open(args.output, 'a' if args.resume else 'w', encoding='utf-8') as out:
+        if args.resume and out.tell() and not output_ends_with_newline(args.output):
+            out.write('\n')  # don't glue onto a line cut off by an interrupted run
+        for result in run_batch(pending, cached_recommendations, nearby_colleges_for, args.workers, args.rate):
+            failed += 'error' in result
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+
+    print(f"Finished: {len(pending) - failed} succeeded, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Catalog loading benchmark: JSON catalog vs the packed, memory-mapped format
+for a synthetic catalog of --size institutions spread over India.
+
+Each format is loaded in a fresh interpreter, which reports the time to
+load and index the catalog, the resident memory it added, and the time of
+one 30 km fallback query.
+
+Run from the repository root:
+    python benchmarks/bench_catalog.py --size 50000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from packed_catalog import build_packed_catalog
+
+CATEGORIES = ['university', 'college', 'education', 'engineering', 'medicine', 'law', 'arts', 'commerce', 'design']
+
+PROBE = r"""
+import json, sys, time
+def rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4
+import numpy
+from college_catalog import load_catalog
+from college_index import CollegeIndex
+before = rss_kb()
+start = time.perf_counter()
+index = CollegeIndex(load_catalog(sys.argv[1]))
+loaded = time.perf_counter()
+after = rss_kb()
+t = time.perf_counter()
+results = index.within_radius(19.0760, 72.8777, 30)
+query = time.perf_counter() - t
+print(json.dumps({"load_ms": (loaded - start) * 1000, "rss_mb": (after - before) / 1024,
+                  "query_ms": query * 1000, "results": len(results)}))
+"""
+
+
+def synthetic_catalog(size, seed=7):
+    rng = random.Random(seed)
+    colleges = []
+    for i in range(size):
+        colleges.append({
+            'name': f"Institute of Studies {i}",
+            'address': f"{rng.randrange(1, 500)} Main Road, District {rng.randrange(700)}, India",
+            'website': f"https://college{i}.edu.in",
+            'phone': f"+91-{rng.randrange(10, 99)}-{rng.randrange(10**7, 10**8)}",
+            'lat': rng.uniform(8, 34),
+            'lon': rng.uniform(68, 97),
+            'categories': ['education'] + rng.sample(CATEGORIES, 2),
+        })
+    return colleges
+
+
+def probe(path):
+    out = subprocess.run([sys.executable, "-c", PROBE, path], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=50000)
+    args = parser.parse_args()
+
+    colleges = synthetic_catalog(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'colleges.json')
+        packed_path = os.path.join(tmp, 'colleges.sihcat')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(colleges, f)
+        build_packed_catalog(colleges, packed_path)
+        print(f"{args.size} colleges: JSON {os.path.getsize(json_path) / 2**20:.1f} MB, "
+              f"packed {os.path.getsize(packed_path) / 2**20:.1f} MB")
+        for label, path in [('json', json_path), ('packed', packed_path)]:
+            result = probe(path)
+            print(f"{label:7s} load+index {result['load_ms']:8.1f} ms  rss +{result['rss_mb']:6.1f} MB  "
+                  f"query {result['query_ms']:6.2f} ms  ({result['results']} results)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Micro-benchmark: scalar haversine loop vs the batched NumPy engine.
+
+Run from the repository root:
+    python benchmarks/bench_distance.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo_distance import haversine_distance, haversine_one_to_many, haversine_many_to_many
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    origin = (17.4260224, 78.6464768)
+
+    for n in (10_000, 1_000_000):
+        # Points spread over India's bounding box
+        lats = rng.uniform(8.0, 37.0, n)
+        lons = rng.uniform(68.0, 97.0, n)
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+
+        scalar = best_of(lambda: [haversine_distance(origin[0], origin[1], la, lo)
+                                  for la, lo in zip(lat_list, lon_list)], repeat=1 if n > 100_000 else 3)
+        vector = best_of(lambda: haversine_one_to_many(origin[0], origin[1], lats, lons))
+        print(f"one-to-many  n={n:>9,}  scalar {scalar * 1000:9.2f} ms  numpy {vector * 1000:8.2f} ms  "
+              f"speedup {scalar / vector:6.1f}x")
+
+    origins = np.column_stack([rng.uniform(8.0, 37.0, 100), rng.uniform(68.0, 97.0, 100)])
+    lats = rng.uniform(8.0, 37.0, 10_000)
+    lons = rng.uniform(68.0, 97.0, 10_000)
+    matrix = best_of(lambda: haversine_many_to_many(origins[:, 0], origins[:, 1], lats, lons))
+    print(f"many-to-many 100 x 10,000  numpy {matrix * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
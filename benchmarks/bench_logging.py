@@ -0,0 +1,96 @@
+"""
+Logging overhead per college lookup: the old synchronous print-style output
+(every payload dump written inline) vs the queued logger at DEBUG and INFO.
+
+Geoapify is replaced by a fake session returning a 50-feature payload, and
+the tile cache is cleared before each call so every lookup does the full
+fetch, filter and distance work. Log output goes to os.devnull.
+
+Run from the repository root:
+    python benchmarks/bench_logging.py
+"""
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from logging_setup import configure_logging
+
+ORIGIN = (17.4260224, 78.6464768)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, features=50):
+        self.data = {'type': 'FeatureCollection', 'features': [
+            {
+                'type': 'Feature',
+                'properties': {
+                    'place_id': f'place-{i}',
+                    'name': f'Government Degree College {i}',
+                    'categories': ['education', 'education.college'],
+                    'lat': ORIGIN[0] + (i % 10) * 0.01,
+                    'lon': ORIGIN[1] + (i // 10) * 0.01,
+                    'formatted': f'{i} College Road, Hyderabad, Telangana, India',
+                    'address_line2': 'Hyderabad, Telangana, India',
+                    'datasource': {'sourcename': 'openstreetmap', 'raw': {'osm_id': i, 'amenity': 'college'}},
+                },
+                'geometry': {'type': 'Point', 'coordinates': [ORIGIN[1], ORIGIN[0]]},
+            }
+            for i in range(features)
+        ]}
+
+    def get(self, url, params=None, timeout=None):
+        return FakeResponse(self.data)
+
+
+def lookup_ms(requests=300):
+    samples = []
+    for _ in range(requests):
+        app.geo_tile_cache.clear()
+        start = time.perf_counter()
+        app.find_nearby_colleges(*ORIGIN)
+        app.get_fallback_colleges(*ORIGIN)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    app.GEOAPIFY_API_KEY = "bench"
+    session = FakeSession()
+    app.get_session = lambda: session
+    devnull = open(os.devnull, 'w')
+    app.get_college_index()
+
+    modes = {}
+    # Equivalent of the old print() calls: everything, formatted inline
+    logger = configure_logging(level="DEBUG", fmt="text", stream=devnull)
+    logger.handlers[:] = [logging.StreamHandler(devnull)]
+    modes['sync, all messages (old prints)'] = lookup_ms()
+    configure_logging(level="DEBUG", fmt="json", stream=devnull)
+    modes['queued json, DEBUG'] = lookup_ms()
+    configure_logging(level="INFO", fmt="json", stream=devnull)
+    modes['queued json, INFO (default)'] = lookup_ms()
+
+    for name, samples in modes.items():
+        samples.sort()
+        print(f"{name:34s} median {statistics.median(samples):7.3f} ms  "
+              f"p95 {samples[int(len(samples) * 0.95)]:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
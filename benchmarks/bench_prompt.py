@@ -0,0 +1,83 @@
+"""
+Prompt benchmark: legacy prose prompt vs the compact coded prompt.
+
+Offline it compares estimated input tokens for sample answer sets. With
+--live N and GEMINI_API_KEY set it also sends N requests per style and
+reports latency and the token counts Gemini reports.
+
+Run from the repository root:
+    python benchmarks/bench_prompt.py [--live 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_builder import build_compact_prompt, estimate_tokens, GENERATION_CONFIG
+
+SAMPLES = {
+    'question bank only': {
+        'q1': 'Science', 'q2': 'Figuring out how things work', 'q3': 'Learning new tech stuff',
+        'q4': 'Breaking it down step-by-step logically', 'q5': 'Hands-on activities and making things',
+        'q6': 'Start alone and then collaborate', 'q7': 'Engineer', 'q8': 'Very exciting',
+        'q9': 'Very important', 'q10': 'Problem-solving mindset', 'q11': 'Coding/Tech',
+        'q12': 'Looking for resources online',
+    },
+    'with free-text hobby': {
+        'q1': 'Arts', 'q2': 'Creating something artistic', 'q3': 'Doing something creative(like designing)',
+        'q4': 'Going with your gut feeling and creativity', 'q5': 'Reading and discussing ideas',
+        'q6': 'Go solo on something you\'re passionate about', 'q7': 'Designer/Artist', 'q8': 'Not sure',
+        'q9': 'Important', 'q10': 'Practical skills',
+        'q11': 'I make short films on my phone and edit them, and I also sketch comics for my school magazine',
+        'q12': 'Combining all approaches',
+    },
+}
+
+
+def legacy_prompt(answers):
+    # app.build_prompt, imported lazily so the offline run needs no API key
+    os.environ.setdefault("GEMINI_API_KEY", "unused-for-offline-benchmark")
+    from app import build_prompt
+    return build_prompt(answers)
+
+
+def live(runs):
+    import google.generativeai as genai
+    genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+    model = genai.GenerativeModel("gemini-1.5-flash")
+    answers = SAMPLES['with free-text hobby']
+    styles = {
+        'legacy': (legacy_prompt(answers), None),
+        'compact': (build_compact_prompt(answers), GENERATION_CONFIG),
+    }
+    for style, (prompt, config) in styles.items():
+        latencies, prompt_tokens, output_tokens = [], [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            response = model.generate_content(prompt, generation_config=config)
+            latencies.append(time.perf_counter() - start)
+            prompt_tokens.append(response.usage_metadata.prompt_token_count)
+            output_tokens.append(response.usage_metadata.candidates_token_count)
+        print(f"{style:8s} p50 {statistics.median(latencies) * 1000:7.0f} ms  max {max(latencies) * 1000:7.0f} ms  "
+              f"input {statistics.median(prompt_tokens):6.0f} tok  output {statistics.median(output_tokens):6.0f} tok")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--live', type=int, default=0, help="Live Gemini requests per prompt style")
+    args = parser.parse_args()
+
+    for name, answers in SAMPLES.items():
+        old = estimate_tokens(legacy_prompt(answers))
+        new = estimate_tokens(build_compact_prompt(answers))
+        print(f"{name:22s} legacy ~{old:4d} tok  compact ~{new:4d} tok  ({new / old:.0%} of legacy)")
+
+    if args.live:
+        live(args.live)
+
+
+if __name__ == "__main__":
+    main()
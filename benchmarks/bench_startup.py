@@ -0,0 +1,54 @@
+"""
+Startup benchmark: app import time plus first-request latency for the
+geo-only endpoints, each measured in a fresh interpreter.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+timings = {"import_ms": (imported - start) * 1000}
+for path, body in [
+    ("/test-fallback", {"latitude": 19.0760, "longitude": 72.8777, "radius_km": 30}),
+    ("/test-distance", {}),
+]:
+    t = time.perf_counter()
+    client.post(path, json=body)
+    timings[path + " first_ms"] = (time.perf_counter() - t) * 1000
+print(json.dumps(timings))
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    # Geo endpoints must work without any keys or network access
+    env.pop("GEMINI_API_KEY", None)
+    env.pop("GEOAPIFY_API_KEY", None)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(runs=5):
+    samples = [run_once() for _ in range(runs)]
+    for key in samples[0]:
+        values = [sample[key] for sample in samples]
+        print(f"{key:28s} median {statistics.median(values):8.1f} ms  min {min(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
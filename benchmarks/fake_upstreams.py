@@ -0,0 +1,147 @@
+"""
+Local stand-ins for the Gemini and Geoapify Places APIs.
+
+One threaded HTTP server answers both:
+    POST /v1beta/models/<model>:generateContent   schema-valid recommendations
+    GET  /v2/places?filter=circle:lon,lat,meters  educational places in the circle
+
+Latency is drawn uniformly from [latency * (1 - jitter), latency * (1 + jitter)]
+per call. Point the app at it with GEMINI_API_ENDPOINT=http://host:port and
+GEOAPIFY_PLACES_URL=http://host:port/v2/places.
+
+Run standalone:
+    python benchmarks/fake_upstreams.py --port 8090 --gemini-latency 0.8
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import riasec
+
+KM_PER_DEGREE = 111.19
+SAMPLE_ANSWERS = [{'q1': option} for option in riasec.ANSWER_WEIGHTS['q1']]
+
+
+class FakeUpstreams:
+    def __init__(self, gemini_latency=0.8, geoapify_latency=0.3, jitter=0.5, features=20,
+                 host='127.0.0.1', port=0):
+        self.gemini_latency = gemini_latency
+        self.geoapify_latency = geoapify_latency
+        self.jitter = jitter
+        self.features = features
+        self.calls = {'gemini': 0, 'geoapify': 0}
+        self._lock = threading.Lock()
+        # Canned model outputs, one per q1 option
+        self._model_texts = []
+        for answers in SAMPLE_ANSWERS:
+            result = riasec.recommend(answers)
+            del result['riasec_profile']
+            self._model_texts.append(json.dumps(result, ensure_ascii=False))
+
+        upstreams = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if ':generateContent' not in self.path:
+                    return self._send(404, {'error': 'not found'})
+                upstreams._count('gemini')
+                upstreams._sleep(upstreams.gemini_latency)
+                self._send(200, {'candidates': [{
+                    'content': {'parts': [{'text': random.choice(upstreams._model_texts)}], 'role': 'model'},
+                    'finishReason': 'STOP'
+                }]})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != '/v2/places':
+                    return self._send(404, {'error': 'not found'})
+                upstreams._count('geoapify')
+                upstreams._sleep(upstreams.geoapify_latency)
+                self._send(200, upstreams.places(parse_qs(url.query)))
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_port}"
+
+    def _count(self, upstream):
+        with self._lock:
+            self.calls[upstream] += 1
+
+    def _sleep(self, latency):
+        if latency > 0:
+            time.sleep(random.uniform(latency * (1 - self.jitter), latency * (1 + self.jitter)))
+
+    def places(self, query):
+        """Feature collection of colleges spread over the requested circle"""
+        lon, lat, meters = (float(value) for value in query['filter'][0].split(':')[1].split(','))
+        radius_deg = meters / 1000 / KM_PER_DEGREE
+        rng = random.Random(f"{lat:.3f},{lon:.3f}")
+        features = []
+        for i in range(min(self.features, int(query.get('limit', ['20'])[0]))):
+            distance = radius_deg * math.sqrt(rng.random())
+            bearing = rng.uniform(0, 2 * math.pi)
+            place_lat = lat + distance * math.cos(bearing)
+            place_lon = lon + distance * math.sin(bearing) / max(math.cos(math.radians(lat)), 0.01)
+            features.append({
+                'type': 'Feature',
+                'properties': {
+                    'place_id': f"fake-{lat:.3f}-{lon:.3f}-{i}",
+                    'name': f"Government Degree College {i}",
+                    'categories': ['education', 'education.college'],
+                    'lat': place_lat,
+                    'lon': place_lon,
+                    'formatted': f"{i} College Road",
+                    'address_line2': 'India',
+                },
+                'geometry': {'type': 'Point', 'coordinates': [place_lon, place_lat]},
+            })
+        return {'type': 'FeatureCollection', 'features': features}
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--gemini-latency', type=float, default=0.8, help="seconds per Gemini call")
+    parser.add_argument('--geoapify-latency', type=float, default=0.3, help="seconds per Places call")
+    parser.add_argument('--jitter', type=float, default=0.5)
+    parser.add_argument('--features', type=int, default=20, help="places returned per search")
+    args = parser.parse_args()
+
+    upstreams = FakeUpstreams(args.gemini_latency, args.geoapify_latency, args.jitter, args.features, port=args.port)
+    print(f"Fake Gemini and Geoapify on {upstreams.url}", file=sys.stderr)
+    upstreams.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
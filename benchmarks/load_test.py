@@ -0,0 +1,231 @@
+"""
+Offline load test: runs app.py against local stand-ins for Gemini and
+Geoapify (benchmarks/fake_upstreams.py) and replays quiz and location
+traffic at each concurrency level.
+
+Reports p50/p95/p99 latency, throughput and errors for /recommend,
+/test-location and /test-fallback. Save a run with --json and compare a
+later one against it with --baseline to catch hot-path regressions (the
+exit status is 1 when any p95 is worse than the baseline by more than
+--tolerance).
+
+Run from the repository root:
+    python benchmarks/load_test.py --concurrency 1,8,32 --requests 200
+    python benchmarks/load_test.py --json before.json
+    python benchmarks/load_test.py --baseline before.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import riasec
+from benchmarks.fake_upstreams import FakeUpstreams
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ['/recommend', '/test-location', '/test-fallback']
+
+CITIES = [
+    (19.0760, 72.8777), (28.6139, 77.2090), (12.9716, 77.5946), (17.3850, 78.4867),
+    (13.0827, 80.2707), (22.5726, 88.3639), (18.5204, 73.8567), (23.0225, 72.5714),
+]
+FREE_TEXT = [
+    "I like building robots and coding small games",
+    "I want to help people and maybe work in a hospital",
+    "drawing comics and designing posters",
+    "I enjoy debating and reading about law and politics",
+    "running a small business with my family",
+    "I love biology and studying animals",
+]
+
+# Flask's threaded server without the debugger and reloader
+APP_SERVER = "{python} -c \"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)\""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def random_location(rng):
+    lat, lon = rng.choice(CITIES)
+    return {'latitude': lat + rng.uniform(-0.2, 0.2), 'longitude': lon + rng.uniform(-0.2, 0.2)}
+
+
+def make_body(endpoint, rng, free_text_rate):
+    """Request body for one simulated user"""
+    location = random_location(rng)
+    if endpoint == '/recommend':
+        answers = {question: rng.choice(list(options)) for question, options in riasec.ANSWER_WEIGHTS.items()}
+        if rng.random() < free_text_rate:
+            # An answer outside the question bank sends the request to Gemini
+            answers[rng.choice(list(answers))] = f"{rng.choice(FREE_TEXT)} ({rng.randrange(10**6)})"
+        return {'answers': answers, 'location': location}
+    if endpoint == '/test-fallback':
+        return dict(location, radius_km=30)
+    return location
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+def run_level(base_url, endpoint, concurrency, total, free_text_rate, seed, timeout):
+    """Send total requests with concurrency workers; returns the latency summary"""
+    rng = random.Random(seed)
+    bodies = [make_body(endpoint, rng, free_text_rate) for _ in range(total)]
+    local = threading.local()
+
+    def send(body):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        session = local.session
+        start = time.perf_counter()
+        try:
+            ok = session.post(base_url + endpoint, json=body, timeout=timeout).status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, bodies))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': errors,
+        'throughput_rps': round(total / wall, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def wait_for_server(base_url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App server exited with status {process.returncode}")
+        try:
+            requests.post(base_url + '/test-distance', json={}, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError("App server did not start in time")
+
+
+def start_app(upstreams, port, server_cmd, extra_env):
+    env = dict(os.environ)
+    env.update({
+        'GEMINI_API_KEY': 'load-test',
+        'GEOAPIFY_API_KEY': 'load-test',
+        'GEMINI_API_ENDPOINT': upstreams.url,
+        'GEOAPIFY_PLACES_URL': upstreams.url + '/v2/places',
+        'LOG_LEVEL': 'WARNING',
+        'APP_WARM_UP': '1',
+    })
+    env.update(extra_env)
+    command = [part.format(port=port, python=sys.executable) for part in shlex.split(server_cmd)]
+    return subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def print_table(rows):
+    header = f"{'endpoint':15s} {'conc':>5s} {'reqs':>6s} {'err':>5s} {'rps':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(f"{row['endpoint']:15s} {row['concurrency']:5d} {row['requests']:6d} {row['errors']:5d} "
+              f"{row['throughput_rps']:8.1f} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['p99_ms']:9.1f}")
+
+
+def compare(rows, baseline_rows, tolerance):
+    """Rows whose p95 regressed by more than tolerance against the baseline"""
+    baseline = {(row['endpoint'], row['concurrency']): row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        before = baseline.get((row['endpoint'], row['concurrency']))
+        if before and row['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append((row, before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--concurrency', default='1,8,32', help="comma-separated levels")
+    parser.add_argument('--requests', type=int, default=200, help="requests per endpoint and level")
+    parser.add_argument('--free-text-rate', type=float, default=0.3,
+                        help="share of /recommend requests with an answer outside the question bank")
+    parser.add_argument('--gemini-latency', type=float, default=0.8)
+    parser.add_argument('--geoapify-latency', type=float, default=0.3)
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=60, help="client timeout per request")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--server-cmd', default=APP_SERVER,
+                        help="command starting the app; {python} and {port} are filled in")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help="extra environment for the app, e.g. --env RECOMMEND_ENGINE=llm")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare p95 against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    upstreams = FakeUpstreams(args.gemini_latency, args.geoapify_latency, features=args.features).start()
+    port = free_port()
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    process = start_app(upstreams, port, args.server_cmd, extra_env)
+    base_url = f"http://127.0.0.1:{port}"
+    rows = []
+    try:
+        wait_for_server(base_url, process)
+        for endpoint in args.endpoints.split(','):
+            for concurrency in (int(level) for level in args.concurrency.split(',')):
+                rows.append(run_level(base_url, endpoint, concurrency, args.requests,
+                                      args.free_text_rate, args.seed + concurrency, args.timeout))
+                print(f"  {endpoint} x{concurrency} done", file=sys.stderr)
+    finally:
+        process.terminate()
+        process.wait()
+        upstreams.stop()
+
+    print_table(rows)
+    print(f"\nUpstream calls: Gemini {upstreams.calls['gemini']}, Geoapify {upstreams.calls['geoapify']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': rows}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(rows, json.load(f)['results'], args.tolerance)
+        for row, before in regressions:
+            print(f"REGRESSION {row['endpoint']} x{row['concurrency']}: "
+                  f"p95 {before['p95_ms']} -> {row['p95_ms']} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
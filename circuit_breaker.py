@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_CODES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream after repeated failures.
+
+    failure_threshold consecutive failures open the circuit; a call that
+    succeeds but takes longer than slow_call_seconds counts as a failure
+    too, so a slow upstream trips it as well as a broken one. While open,
+    calls fail fast with CircuitOpenError. After reset_seconds one probe
+    call is let through (half-open): success closes the circuit, failure
+    opens it again with the wait doubled, up to max_reset_seconds.
+    """
+
+    def __init__(self, name, failure_threshold=5, slow_call_seconds=None, reset_seconds=30, max_reset_seconds=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._wait = reset_seconds
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go ahead now"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self._wait:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == OPEN or (self.state == HALF_OPEN and self._probing):
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            if self.state == HALF_OPEN:
+                self._probing = True
+            self.calls += 1
+
+    def record(self, success, elapsed):
+        """Outcome of a call allowed by before_call()"""
+        slow = self.slow_call_seconds is not None and elapsed > self.slow_call_seconds
+        with self._lock:
+            if slow:
+                self.slow_calls += 1
+            if success and not slow:
+                self._failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    self._wait = self.reset_seconds
+                return
+            self.failures += 1
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                self._wait = min(self._wait * 2, self.max_reset_seconds)
+                self._open()
+            elif self.state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def abandon(self):
+        """
+        A call allowed by before_call() ended without an outcome, such as a
+        stream the client stopped reading. Frees the half-open probe slot.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        self.opened += 1
+
+    def call(self, fn):
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self.record(False, time.monotonic() - start)
+            raise
+        self.record(True, time.monotonic() - start)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'calls': self.calls,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls,
+                'rejected': self.rejected,
+                'opened': self.opened,
+                'reset_seconds': self._wait
+            }
+
+
+def breaker_from_env(name, slow_call_seconds):
+    """Circuit breaker for an upstream from <NAME>_BREAKER_* environment variables"""
+    prefix = f"{name.upper()}_BREAKER"
+    slow = os.getenv(f"{prefix}_SLOW_SECONDS", str(slow_call_seconds))
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv(f"{prefix}_FAILURES", "5")),
+        slow_call_seconds=float(slow) if slow else None,
+        reset_seconds=float(os.getenv(f"{prefix}_RESET_SECONDS", "30")),
+        max_reset_seconds=float(os.getenv(f"{prefix}_MAX_RESET_SECONDS", "300"))
+    )
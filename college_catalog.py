@@ -0,0 +1,240 @@
+import csv
+import json
+import os
+
+from packed_catalog import PackedCatalog
+
+# Popular Indian colleges with their coordinates - covering major cities
+FALLBACK_COLLEGES = [
+    # Mumbai colleges
+    {
+        'name': 'Indian Institute of Technology Bombay',
+        'address': 'Powai, Mumbai, Maharashtra 400076',
+        'website': 'https://www.iitb.ac.in',
+        'phone': '+91-22-2572-2545',
+        'lat': 19.1334,
+        'lon': 72.9133,
+        'categories': ['university', 'education', 'engineering']
+    },
+    {
+        'name': 'University of Mumbai',
+        'address': 'Kalina, Santacruz East, Mumbai, Maharashtra 400098',
+        'website': 'https://mu.ac.in',
+        'phone': '+91-22-2652-3000',
+        'lat': 19.0760,
+        'lon': 72.8777,
+        'categories': ['university', 'education']
+    },
+    {
+        'name': 'St. Xavier\'s College',
+        'address': 'Mahapalika Marg, Dhobi Talao, Mumbai, Maharashtra 400001',
+        'website': 'https://xaviers.edu',
+        'phone': '+91-22-2262-1300',
+        'lat': 18.9368,
+        'lon': 72.8276,
+        'categories': ['college', 'education', 'arts']
+    },
+    # Delhi colleges
+    {
+        'name': 'Delhi University',
+        'address': 'North Campus, Delhi 110007',
+        'website': 'https://du.ac.in',
+        'phone': '+91-11-2766-7777',
+        'lat': 28.6892,
+        'lon': 77.2090,
+        'categories': ['university', 'education']
+    },
+    {
+        'name': 'Indian Institute of Technology Delhi',
+        'address': 'Hauz Khas, New Delhi 110016',
+        'website': 'https://home.iitd.ac.in',
+        'phone': '+91-11-2659-7135',
+        'lat': 28.5455,
+        'lon': 77.1923,
+        'categories': ['university', 'education', 'engineering']
+    },
+    {
+        'name': 'AIIMS Delhi',
+        'address': 'Ansari Nagar, New Delhi 110029',
+        'website': 'https://www.aiims.edu',
+        'phone': '+91-11-2658-8500',
+        'lat': 28.5665,
+        'lon': 77.2100,
+        'categories': ['university', 'education', 'medicine']
+    },
+    {
+        'name': 'Jawaharlal Nehru University',
+        'address': 'New Mehrauli Road, New Delhi 110067',
+        'website': 'https://www.jnu.ac.in',
+        'phone': '+91-11-2670-4100',
+        'lat': 28.5402,
+        'lon': 77.1660,
+        'categories': ['university', 'education']
+    },
+    # Hyderabad colleges
+    {
+        'name': 'Indian Institute of Technology Hyderabad',
+        'address': 'Kandi, Sangareddy, Telangana 502285',
+        'website': 'https://iith.ac.in',
+        'phone': '+91-40-2301-6032',
+        'lat': 17.5926,
+        'lon': 78.1271,
+        'categories': ['university', 'education', 'engineering']
+    },
+    {
+        'name': 'University of Hyderabad',
+        'address': 'Gachibowli, Hyderabad, Telangana 500046',
+        'website': 'https://uohyd.ac.in',
+        'phone': '+91-40-2313-2000',
+        'lat': 17.4590,
+        'lon': 78.3480,
+        'categories': ['university', 'education']
+    },
+    {
+        'name': 'Osmania University',
+        'address': 'Osmania University, Hyderabad, Telangana 500007',
+        'website': 'https://osmania.ac.in',
+        'phone': '+91-40-2768-2222',
+        'lat': 17.4065,
+        'lon': 78.4772,
+        'categories': ['university', 'education']
+    },
+    {
+        'name': 'NALSAR University of Law',
+        'address': 'Justice City, Shamirpet, Hyderabad, Telangana 500101',
+        'website': 'https://www.nalsar.ac.in',
+        'phone': '+91-40-2349-8100',
+        'lat': 17.5123,
+        'lon': 78.4567,
+        'categories': ['university', 'education', 'law']
+    },
+    # Bangalore colleges
+    {
+        'name': 'Indian Institute of Science Bangalore',
+        'address': 'C.V. Raman Ave, Bengaluru, Karnataka 560012',
+        'website': 'https://www.iisc.ac.in',
+        'phone': '+91-80-2293-2000',
+        'lat': 12.9914,
+        'lon': 77.5921,
+        'categories': ['university', 'education', 'science']
+    },
+    {
+        'name': 'Indian Institute of Management Bangalore',
+        'address': 'Bannerghatta Road, Bengaluru, Karnataka 560076',
+        'website': 'https://www.iimb.ac.in',
+        'phone': '+91-80-2699-3000',
+        'lat': 12.8914,
+        'lon': 77.6010,
+        'categories': ['university', 'education', 'management']
+    },
+    {
+        'name': 'Bangalore University',
+        'address': 'Jnana Bharathi, Bengaluru, Karnataka 560056',
+        'website': 'https://bangaloreuniversity.ac.in',
+        'phone': '+91-80-2321-0101',
+        'lat': 12.8567,
+        'lon': 77.5049,
+        'categories': ['university', 'education']
+    },
+    # Chennai colleges
+    {
+        'name': 'Indian Institute of Technology Madras',
+        'address': 'IIT P.O., Chennai, Tamil Nadu 600036',
+        'website': 'https://www.iitm.ac.in',
+        'phone': '+91-44-2257-8000',
+        'lat': 12.9914,
+        'lon': 80.2337,
+        'categories': ['university', 'education', 'engineering']
+    },
+    {
+        'name': 'Anna University',
+        'address': 'Sardar Patel Rd, Guindy, Chennai, Tamil Nadu 600025',
+        'website': 'https://www.annauniv.edu',
+        'phone': '+91-44-2235-1777',
+        'lat': 12.9850,
+        'lon': 80.2177,
+        'categories': ['university', 'education', 'engineering']
+    },
+    # Pune colleges
+    {
+        'name': 'Indian Institute of Science Education and Research Pune',
+        'address': 'Dr. Homi Bhabha Road, Pune, Maharashtra 411008',
+        'website': 'https://www.iiserpune.ac.in',
+        'phone': '+91-20-2590-8000',
+        'lat': 18.5474,
+        'lon': 73.8164,
+        'categories': ['university', 'education', 'science']
+    },
+    {
+        'name': 'University of Pune',
+        'address': 'Ganeshkhind, Pune, Maharashtra 411007',
+        'website': 'https://www.unipune.ac.in',
+        'phone': '+91-20-2569-0000',
+        'lat': 18.5522,
+        'lon': 73.8267,
+        'categories': ['university', 'education']
+    },
+    # Kolkata colleges
+    {
+        'name': 'Indian Institute of Technology Kharagpur',
+        'address': 'Kharagpur, West Bengal 721302',
+        'website': 'https://www.iitkgp.ac.in',
+        'phone': '+91-3222-255-221',
+        'lat': 22.3149,
+        'lon': 87.3105,
+        'categories': ['university', 'education', 'engineering']
+    },
+    {
+        'name': 'University of Calcutta',
+        'address': 'Senate House, 87/1, College Street, Kolkata, West Bengal 700073',
+        'website': 'https://www.caluniv.ac.in',
+        'phone': '+91-33-2241-0071',
+        'lat': 22.5726,
+        'lon': 88.3639,
+        'categories': ['university', 'education']
+    },
+    # Vellore colleges
+    {
+        'name': 'Vellore Institute of Technology',
+        'address': 'Vellore, Tamil Nadu 632014',
+        'website': 'https://vit.ac.in',
+        'phone': '+91-416-220-2000',
+        'lat': 12.9692,
+        'lon': 79.1559,
+        'categories': ['university', 'education', 'engineering']
+    }
+]
+
+
+def load_catalog(path=None):
+    """
+    Load the college catalog from a JSON, CSV or packed file, or the built-in list.
+
+    JSON files hold a list of college dicts. CSV files need name, lat and lon
+    columns; categories are separated by ';'. Packed .sihcat files (see
+    packed_catalog.py) are memory-mapped rather than read.
+    """
+    if not path:
+        return FALLBACK_COLLEGES
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.sihcat':
+        return PackedCatalog(path)
+
+    if extension == '.csv':
+        colleges = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                colleges.append({
+                    'name': row['name'],
+                    'address': row.get('address', ''),
+                    'website': row.get('website', ''),
+                    'phone': row.get('phone', ''),
+                    'lat': float(row['lat']),
+                    'lon': float(row['lon']),
+                    'categories': [c.strip() for c in row.get('categories', '').split(';') if c.strip()]
+                })
+        return colleges
+
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
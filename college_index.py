@@ -0,0 +1,148 @@
+from math import radians, cos, floor, pi
+
+import numpy as np
+
+from geo_distance import EARTH_RADIUS_KM, haversine_one_to_many
+from packed_catalog import PackedCatalog, encode_categories
+
+KM_PER_DEGREE_LAT = 111.19
+
+
+class CollegeIndex:
+    """
+    Fixed-size lat/lon grid over the college catalog.
+
+    The catalog is bucketed once at startup. Radius queries only compute
+    distances for colleges in the cells overlapping the query's bounding box,
+    then apply the same haversine filter as a full scan would. A
+    PackedCatalog already carries its grid, so its arrays are used as-is
+    and its cell_deg overrides the argument.
+
+    Discipline categories are also indexed: a bitmask per college plus
+    postings, the sorted ids of the colleges in each category, for
+    ranked_within().
+    """
+
+    def __init__(self, colleges, cell_deg=0.5):
+        if isinstance(colleges, PackedCatalog):
+            self.colleges = colleges
+            self.cell_deg = colleges.cell_deg
+            self.lon_cells = int(round(360 / self.cell_deg))
+            self.lats = colleges.lats
+            self.lons = colleges.lons
+            self.cells = colleges.cells
+            self.category_names = colleges.category_names
+            self.category_masks = colleges.category_masks
+        else:
+            self.colleges = list(colleges)
+            self.cell_deg = cell_deg
+            self.lon_cells = int(round(360 / cell_deg))
+            self.lats = np.array([college['lat'] for college in self.colleges], dtype=np.float64)
+            self.lons = np.array([college['lon'] for college in self.colleges], dtype=np.float64)
+            cells = {}
+            for i, college in enumerate(self.colleges):
+                cells.setdefault(self._cell(college['lat'], college['lon']), []).append(i)
+            self.cells = {cell: np.array(members, dtype=np.intp) for cell, members in cells.items()}
+            self.category_names, self.category_masks = encode_categories(self.colleges)
+        self.category_bits = {name: bit for bit, name in enumerate(self.category_names)}
+        self.postings = {
+            name: np.flatnonzero(self.category_masks & np.uint64(1 << bit))
+            for name, bit in self.category_bits.items()
+        }
+
+    def __len__(self):
+        return len(self.colleges)
+
+    def _cell(self, lat, lon):
+        return (floor(lat / self.cell_deg), floor(lon / self.cell_deg) % self.lon_cells)
+
+    def _candidates(self, lat, lon, radius_km):
+        """Indices of colleges in cells that may lie within radius_km"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        lat_min, lat_max = lat - dlat, lat + dlat
+        if lat_min <= -90 or lat_max >= 90:
+            # The circle reaches a pole, so every longitude is in range
+            lon_range = range(self.lon_cells)
+        else:
+            widest = cos(radians(max(abs(lat_min), abs(lat_max))))
+            dlon = dlat / widest
+            if dlon >= 180:
+                lon_range = range(self.lon_cells)
+            else:
+                first = floor((lon - dlon) / self.cell_deg)
+                last = floor((lon + dlon) / self.cell_deg)
+                lon_range = range(first, min(last, first + self.lon_cells - 1) + 1)
+
+        candidates = []
+        for lat_cell in range(floor(lat_min / self.cell_deg), floor(lat_max / self.cell_deg) + 1):
+            for lon_cell in lon_range:
+                members = self.cells.get((lat_cell, lon_cell % self.lon_cells))
+                if members is not None:
+                    candidates.append(members)
+        if not candidates:
+            return np.empty(0, dtype=np.intp)
+        # Keep catalog order so results match a linear scan
+        return np.sort(np.concatenate(candidates))
+
+    def within_radius(self, lat, lon, radius_km):
+        """(college, distance_km) pairs within radius_km, in catalog order"""
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_one_to_many(lat, lon, self.lats[candidates], self.lons[candidates])
+        mask = distances <= radius_km
+        return [(self.colleges[i], float(d)) for i, d in zip(candidates[mask], distances[mask])]
+
+    def ranked_within(self, lat, lon, radius_km, tags=(), limit=None):
+        """
+        (college, distance_km, matched_tags) within radius_km, best match first.
+
+        Colleges in more of the tags categories come first, nearer first
+        within the same count. Matching colleges are read from the postings
+        when those are shorter than the grid candidates, and the rest of the
+        neighbourhood is only measured if the matches don't fill limit.
+        """
+        wanted = sorted(tag for tag in set(tags) if tag in self.postings)
+        candidates = self._candidates(lat, lon, radius_km)
+        results = []
+        matched = np.empty(0, dtype=np.intp)
+        if wanted:
+            if sum(len(self.postings[tag]) for tag in wanted) < len(candidates):
+                matched = np.unique(np.concatenate([self.postings[tag] for tag in wanted]))
+            else:
+                wanted_mask = np.uint64(sum(1 << self.category_bits[tag] for tag in wanted))
+                matched = candidates[(self.category_masks[candidates] & wanted_mask) != 0]
+            distances = haversine_one_to_many(lat, lon, self.lats[matched], self.lons[matched])
+            keep = distances <= radius_km
+            matched, distances = matched[keep], distances[keep]
+            masks = self.category_masks[matched]
+            counts = sum((masks >> np.uint64(self.category_bits[tag])) & np.uint64(1) for tag in wanted)
+            order = np.lexsort((matched, distances, -counts.astype(np.int64)))[:limit]
+            for i, distance, mask in zip(matched[order], distances[order], masks[order]):
+                mask = int(mask)
+                tags_matched = [tag for tag in wanted if mask >> self.category_bits[tag] & 1]
+                results.append((self.colleges[i], float(distance), tags_matched))
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+
+        rest = np.setdiff1d(candidates, matched, assume_unique=True)
+        distances = haversine_one_to_many(lat, lon, self.lats[rest], self.lons[rest])
+        keep = distances <= radius_km
+        rest, distances = rest[keep], distances[keep]
+        order = np.lexsort((rest, distances))
+        for i, distance in zip(rest[order], distances[order]):
+            if limit is not None and len(results) >= limit:
+                break
+            results.append((self.colleges[i], float(distance), []))
+        return results
+
+    def nearest(self, lat, lon, k=10, max_radius_km=None):
+        """The k closest (college, distance_km) pairs, nearest first"""
+        # Half the circumference is the farthest any two points can be
+        limit = max_radius_km if max_radius_km is not None else pi * EARTH_RADIUS_KM
+        radius_km = min(50, limit)
+        while True:
+            results = self.within_radius(lat, lon, radius_km)
+            if len(results) >= k or radius_km >= limit:
+                break
+            radius_km = min(radius_km * 4, limit)
+        results.sort(key=lambda pair: pair[1])
+        return results[:k]
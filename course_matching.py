@@ -0,0 +1,62 @@
+"""
+Discipline tags for recommended courses and for colleges.
+
+Tags are the discipline categories used in the college catalog
+(engineering, medicine, law, ...). Courses are tagged from keywords in
+their titles. Catalog colleges are tagged by their categories; Geoapify
+places only carry generic categories, so their names are checked for the
+same keywords.
+"""
+import re
+
+DISCIPLINE_KEYWORDS = {
+    'engineering': ['b.tech', 'btech', 'b.e.', 'm.tech', 'engineering', 'technology', 'polytechnic'],
+    'medicine': ['mbbs', 'bds', 'bams', 'medical', 'medicine', 'nursing', 'pharmacy', 'b.pharm', 'physiotherapy'],
+    'science': ['b.sc', 'bsc', 'm.sc', 'science', 'sciences'],
+    'arts': ['ba', 'b.a.', 'b.a', 'arts', 'humanities', 'journalism', 'mass communication', 'psychology', 'literature'],
+    'law': ['llb', 'll.b', 'law', 'legal'],
+    'management': ['bba', 'mba', 'b.com', 'commerce', 'management', 'business', 'ca foundation'],
+    'design': ['b.des', 'design', 'b.arch', 'architecture', 'fashion', 'fine arts'],
+    'teaching': ['b.ed', 'b.p.ed', 'teacher', 'teaching'],
+}
+DISCIPLINES = frozenset(DISCIPLINE_KEYWORDS)
+
+_DISCIPLINE_PATTERNS = {
+    tag: re.compile(r'(?<![a-z])(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')(?![a-z])')
+    for tag, keywords in DISCIPLINE_KEYWORDS.items()
+}
+
+
+def text_tags(text):
+    """Discipline tags whose keywords appear in text"""
+    text = text.lower()
+    return {tag for tag, pattern in _DISCIPLINE_PATTERNS.items() if pattern.search(text)}
+
+
+def course_tags(courses):
+    """Discipline tags of the recommended courses"""
+    tags = set()
+    for course in courses or []:
+        if isinstance(course, dict):
+            tags |= text_tags(course.get('title', ''))
+    return tags
+
+
+def college_tags(college):
+    """Discipline tags of a college from its categories and name"""
+    tags = {category for category in college.get('categories', []) if category in DISCIPLINES}
+    return tags | text_tags(college.get('name', ''))
+
+
+def rank_colleges(colleges, tags):
+    """
+    Colleges ordered by how many of tags they match, then by distance.
+
+    Each college gets a course_match list of the tags it matched. Meant for
+    short result lists; catalog queries use CollegeIndex.ranked_within().
+    """
+    if not tags:
+        return colleges
+    for college in colleges:
+        college['course_match'] = sorted(college_tags(college) & tags)
+    return sorted(colleges, key=lambda college: (-len(college['course_match']), college.get('distance', 0)))
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from math import cos, radians, floor, sqrt
+
+from logging_setup import get_logger
+
+log = get_logger("geo_tile_cache")
+
+KM_PER_DEGREE = 111.19
+
+
+def tile_for(latitude, longitude, tile_deg):
+    """Integer tile coordinates of the quantized location"""
+    return (floor(latitude / tile_deg), floor(longitude / tile_deg))
+
+
+def tile_center(tile, tile_deg):
+    """Center of a tile as (latitude, longitude)"""
+    return (round((tile[0] + 0.5) * tile_deg, 6), round((tile[1] + 0.5) * tile_deg, 6))
+
+
+def tile_half_diagonal_km(tile, tile_deg):
+    """Farthest any point in the tile can be from its center"""
+    lat_km = tile_deg / 2 * KM_PER_DEGREE
+    lon_km = tile_deg / 2 * KM_PER_DEGREE * cos(radians(min(abs(tile[0] * tile_deg), abs((tile[0] + 1) * tile_deg))))
+    return sqrt(lat_km ** 2 + lon_km ** 2)
+
+
+class GeoTileCache:
+    """
+    TTL cache of upstream place results keyed by location tile.
+
+    Entries are fresh for ttl_seconds. After that they are still served for
+    up to stale_seconds while a single background refresh replaces them;
+    beyond that the caller fetches synchronously. Empty results are only
+    kept for empty_ttl_seconds and never served stale.
+    """
+
+    def __init__(self, tile_deg=0.05, ttl_seconds=3600, stale_seconds=86400, max_size=4096, empty_ttl_seconds=60):
+        self.tile_deg = tile_deg
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.empty_ttl_seconds = empty_ttl_seconds
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def get_or_fetch(self, key, fetch):
+        """Cached value for key, calling fetch() on a miss or to revalidate"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                ttl, stale = (self.ttl_seconds, self.stale_seconds) if value else (self.empty_ttl_seconds, 0)
+                if age <= ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if age <= ttl + stale:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+                    return value
+                del self._entries[key]
+            self.misses += 1
+
+        value = fetch()
+        self.set(key, value)
+        return value
+
+    def _refresh(self, key, fetch):
+        try:
+            self.set(key, fetch())
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            log.warning("Background refresh failed for %s: %s", key, e)
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'tile_deg': self.tile_deg,
+                'ttl_seconds': self.ttl_seconds,
+                'stale_seconds': self.stale_seconds,
+                'empty_ttl_seconds': self.empty_ttl_seconds,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'hit_rate': round((self.hits + self.stale_hits) / total, 4) if total else 0.0
+            }
+
+
+def tile_cache_from_env():
+    """Build the tile cache from GEO_CACHE_* environment variables"""
+    return GeoTileCache(
+        tile_deg=float(os.getenv("GEO_CACHE_TILE_DEG", "0.05")),
+        ttl_seconds=float(os.getenv("GEO_CACHE_TTL", "3600")),
+        stale_seconds=float(os.getenv("GEO_CACHE_STALE", "86400")),
+        max_size=int(os.getenv("GEO_CACHE_SIZE", "4096")),
+        empty_ttl_seconds=float(os.getenv("GEO_CACHE_EMPTY_TTL", "60"))
+    )
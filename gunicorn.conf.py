@@ -0,0 +1,35 @@
+"""
+Production serving: gunicorn with gevent workers.
+
+    gunicorn app:app
+
+Each worker process serves up to GUNICORN_WORKER_CONNECTIONS requests at
+once as greenlets, so requests waiting on Gemini or Geoapify only hold a
+cheap greenlet instead of an OS thread. The app's stage pools and the
+upstream connection pool are sized to match, and Gemini is called over
+REST because its default gRPC transport would block the event loop.
+Any of these can still be overridden from the environment.
+"""
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gevent"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "2000"))
+# Longer than the slowest stage deadline (RECOMMEND_MODEL_TIMEOUT)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so leaks can't accumulate
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "20000"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+# Read by app.py when each worker imports it
+os.environ.setdefault("GEMINI_TRANSPORT", "rest")
+os.environ.setdefault("RECOMMEND_STAGE_WORKERS", str(worker_connections * 2))
+os.environ.setdefault("GEOAPIFY_SEARCH_WORKERS", str(worker_connections * 2))
+os.environ.setdefault("HTTP_POOL_MAXSIZE", "200")
+os.environ.setdefault("HEDGE_WORKERS", str(worker_connections))
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+
+from metrics import submit_in_context
+
+
+class Hedger:
+    """
+    Hedged calls to a slow-tailed upstream.
+
+    A call runs on the executor; if it hasn't finished after the recent
+    percentile latency (p95 by default) an identical second call is sent,
+    and whichever succeeds first wins. The loser is left to finish in the
+    background. Only for idempotent calls. Until min_samples latencies have
+    been seen, or when disabled, calls run inline without hedging.
+    """
+
+    def __init__(self, executor, enabled=True, percentile=95, window=200, min_samples=20,
+                 min_delay=0.05, max_delay=10.0):
+        self.executor = executor
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self):
+        """Seconds to wait before hedging, or None while there are too few samples"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = np.fromiter(self._latencies, dtype=np.float64)
+        return min(max(float(np.percentile(latencies, self.percentile)), self.min_delay), self.max_delay)
+
+    def _timed(self, fn):
+        start = time.monotonic()
+        result = fn()
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return result
+
+    def call(self, fn):
+        with self._lock:
+            self.calls += 1
+        delay = self.delay() if self.enabled else None
+        if delay is None:
+            return self._timed(fn)
+
+        first = submit_in_context(self.executor, self._timed, fn)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        with self._lock:
+            self.hedged += 1
+        second = submit_in_context(self.executor, self._timed, fn)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def stats(self):
+        delay = self.delay()
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'hedge_delay_seconds': round(delay, 4) if delay is not None else None
+            }
+
+
+def hedger_from_env(name, executor):
+    """Hedger for an upstream; enabled when name is listed in HEDGE_UPSTREAMS (comma-separated)"""
+    enabled = name in [upstream.strip() for upstream in os.getenv("HEDGE_UPSTREAMS", "").lower().split(",")]
+    return Hedger(
+        executor,
+        enabled=enabled,
+        percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+        min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20")),
+        max_delay=float(os.getenv("HEDGE_MAX_DELAY", "10"))
+    )
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError, MaxRetryError, ReadTimeoutError, ResponseError
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class DeadlineTimeout(Timeout):
+    """
+    urllib3 timeout whose connect and read timeouts never run past an
+    absolute deadline, so retries share one time budget.
+    """
+
+    def __init__(self, deadline=None, pool_timeout=None, **kwargs):
+        super().__init__(**kwargs)
+        self.deadline = deadline
+        self.pool_timeout = pool_timeout
+
+    def clone(self):
+        return DeadlineTimeout(self.deadline, self.pool_timeout, connect=self._connect, read=self._read, total=self.total)
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.001)
+
+    def _clamp(self, seconds):
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        if not isinstance(seconds, (int, float)):
+            return remaining
+        return min(seconds, remaining)
+
+    @property
+    def connect_timeout(self):
+        return self._clamp(super().connect_timeout)
+
+    @property
+    def read_timeout(self):
+        return self._clamp(super().read_timeout)
+
+    def pool_wait(self):
+        """How long to wait for a free pooled connection"""
+        waits = [wait for wait in (self.pool_timeout, self.remaining()) if wait is not None]
+        return min(waits) if waits else None
+
+
+class DeadlineRetry(Retry):
+    """
+    urllib3 retry policy that gives up once an absolute deadline has
+    passed and never sleeps past it between attempts.
+    """
+
+    def __init__(self, *args, deadline=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+
+    def new(self, **kw):
+        kw.setdefault('deadline', self.deadline)
+        return super().new(**kw)
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        remaining = self.remaining()
+        if remaining is None:
+            return backoff
+        return max(min(backoff, remaining), 0)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise MaxRetryError(_pool, url, error or ResponseError("request deadline passed"))
+        return retry
+
+
+class _DeadlinePoolMixin:
+    def urlopen(self, method, url, *args, pool_timeout=None, **kwargs):
+        timeout = kwargs.get('timeout')
+        if isinstance(timeout, DeadlineTimeout):
+            if pool_timeout is None:
+                pool_timeout = timeout.pool_wait()
+            # The adapter's policy is shared; bind this request's deadline to a copy
+            retries = kwargs.get('retries')
+            if isinstance(retries, DeadlineRetry) and retries.deadline != timeout.deadline:
+                kwargs['retries'] = retries.new(deadline=timeout.deadline)
+        return super().urlopen(method, url, *args, pool_timeout=pool_timeout, **kwargs)
+
+
+class _DeadlineHTTPConnectionPool(_DeadlinePoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _DeadlineHTTPSConnectionPool(_DeadlinePoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class DeadlineAdapter(HTTPAdapter):
+    """
+    HTTPAdapter where a request's timeout is one deadline for the whole
+    call: connection pool wait, retries and backoff included. A (connect,
+    read) tuple allows their sum. Waits for a pooled connection are also
+    capped by pool_timeout.
+    """
+
+    def __init__(self, pool_timeout=None, **kwargs):
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _DeadlineHTTPConnectionPool,
+            'https': _DeadlineHTTPSConnectionPool
+        }
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            budget = connect + read if connect is not None and read is not None else None
+        elif isinstance(timeout, Timeout):
+            connect, read, budget = timeout.connect_timeout, timeout.read_timeout, timeout.total
+        else:
+            connect = read = budget = timeout
+        deadline = time.monotonic() + budget if isinstance(budget, (int, float)) else None
+        timeout = DeadlineTimeout(deadline, self.pool_timeout, connect=connect, read=read)
+        try:
+            return super().send(request, stream=stream, timeout=timeout, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        except requests.exceptions.ConnectionError as e:
+            # requests reports retries that ended on a read timeout as a connection error
+            reason = e.args[0].reason if e.args and isinstance(e.args[0], MaxRetryError) else None
+            if isinstance(reason, ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(e, request=request)
+            raise
+
+
+def build_session(pool_maxsize=20, pool_connections=4, retries=2, backoff_factor=0.3, pool_timeout=10):
+    """
+    Keep-alive session for upstream API calls.
+
+    pool_maxsize caps open connections per host; with pool_block set, extra
+    worker threads wait (up to pool_timeout, or the request's deadline) for
+    a free connection instead of opening new ones. Idempotent GETs are
+    retried with exponential backoff on connection errors and 429/5xx
+    responses, but not after a read timeout. Retry-After is ignored and
+    backoff sleeps are cut short so no retry outlasts the request's timeout.
+    """
+    retry = DeadlineRetry(
+        total=retries,
+        connect=retries,
+        read=False,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+    adapter = DeadlineAdapter(
+        pool_timeout=pool_timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+        pool_block=True
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Process-wide shared session, created on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(
+                    pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "20")),
+                    retries=int(os.getenv("HTTP_RETRIES", "2")),
+                    backoff_factor=float(os.getenv("HTTP_BACKOFF", "0.3")),
+                    pool_timeout=float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+                )
+    return _session
+
+
+def pool_stats():
+    """Per-host connection pool usage for the shared session"""
+    if _session is None:
+        return {'hosts': {}}
+
+    hosts = {}
+    for adapter in set(_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened = pool.num_connections
+            served = pool.num_requests
+            # The pool queue is pre-filled with None placeholders
+            idle = [conn for conn in list(pool.pool.queue) if conn is not None] if pool.pool is not None else []
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                'max_size': pool.pool.maxsize if pool.pool is not None else 0,
+                'idle_connections': len(idle),
+                'connections_opened': opened,
+                'requests': served,
+                'connections_reused': max(served - opened, 0)
+            }
+    return {'hosts': hosts}
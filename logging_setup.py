@@ -0,0 +1,111 @@
+"""
+Structured, non-blocking logging for the app.
+
+Request threads only put records on an in-memory queue; a single listener
+thread formats them and writes to stderr. Records below WARNING can be
+sampled with LOG_SAMPLE_RATE, and large payload dumps are logged at DEBUG
+so they cost nothing unless LOG_LEVEL=DEBUG.
+
+Environment:
+    LOG_LEVEL        DEBUG, INFO (default), WARNING, ...
+    LOG_FORMAT       json (default) or text
+    LOG_SAMPLE_RATE  fraction of DEBUG/INFO records kept (default 1.0)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any fields passed via extra={"fields": {...}}"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records as-is so message formatting also happens on the listener
+    thread; the stock handler formats in the caller to make records picklable,
+    which an in-process queue doesn't need.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random sample_rate fraction of records below WARNING"""
+
+    def __init__(self, sample_rate):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+
+def configure_logging(level=None, fmt=None, sample_rate=None, stream=None):
+    """Route the app's loggers through a queue to one background writer"""
+    global _listener
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    sample_rate = float(sample_rate if sample_rate is not None else os.getenv("LOG_SAMPLE_RATE", "1"))
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        formatter.converter = time.gmtime
+        output.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger("sih")
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+    root.propagate = False
+    return root
+
+
+def get_logger(name):
+    """Logger under the app's "sih" namespace"""
+    return logging.getLogger(f"sih.{name}")
+
+
+@atexit.register
+def _flush():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
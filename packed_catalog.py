@@ -0,0 +1,204 @@
+"""
+Compact binary college catalog, memory-mapped at load time.
+
+Build one from a JSON or CSV catalog (same formats as load_catalog):
+    python packed_catalog.py colleges.csv colleges.sihcat
+
+and point COLLEGE_CATALOG_PATH at the .sihcat file. Coordinates, category
+bitmasks and string ids live in packed arrays read straight from the
+mapping, strings are interned once in a shared table, and the spatial grid
+is precomputed, so every worker process shares one read-only copy of the
+pages and startup doesn't parse or bucket anything.
+
+Layout (little-endian, sections 8-byte aligned, in this order):
+    header           magic, count, strings, categories, cells, cell_deg
+    lats, lons       float64[count]
+    category_masks   uint64[count]       bit i = category_names[i] (discipline categories only)
+    fields           uint32[count, 5]    string ids of name, address, website, phone
+                                         and the ';'-joined categories (source order)
+    cell_order       uint32[count]       record ids grouped by grid cell
+    cell_keys        int32[cells, 2]     (lat_cell, lon_cell)
+    cell_starts      uint32[cells + 1]   slice of cell_order per cell
+    category_ids     uint32[categories]  string ids of category names
+    string_offsets   uint32[strings + 1]
+    string_data      utf-8 bytes
+"""
+import argparse
+import mmap
+import struct
+import sys
+from math import floor
+
+import numpy as np
+
+from course_matching import DISCIPLINES
+
+MAGIC = b'SIHCAT01'
+HEADER = struct.Struct('<8sIIIId')
+STRING_FIELDS = ('name', 'address', 'website', 'phone')
+CATEGORY_SEPARATOR = ';'
+MAX_CATEGORIES = 64
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def grid_cell(lat, lon, cell_deg):
+    """Grid cell of a point, matching CollegeIndex"""
+    lon_cells = int(round(360 / cell_deg))
+    return floor(lat / cell_deg), floor(lon / cell_deg) % lon_cells
+
+
+def encode_categories(colleges, indexed=DISCIPLINES):
+    """
+    Category names in first-seen order and a uint64 bitmask per college (bit
+    i = names[i]). Only categories in indexed get a bit, the ones course
+    matching ranks by, so catalogs may use any number of other categories.
+    """
+    names = {}
+    masks = np.zeros(len(colleges), dtype='<u8')
+    for i, college in enumerate(colleges):
+        mask = 0
+        for category in college.get('categories', []):
+            if indexed is not None and category not in indexed:
+                continue
+            bit = names.setdefault(category, len(names))
+            if bit == MAX_CATEGORIES:
+                raise ValueError(f"More than {MAX_CATEGORIES} distinct categories")
+            mask |= 1 << bit
+        masks[i] = mask
+    return list(names), masks
+
+
+def build_packed_catalog(colleges, path, cell_deg=0.5):
+    """Write colleges (a list of college dicts) to path in the packed format"""
+    strings = {}
+
+    def intern(text):
+        text = text or ''
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    category_names, masks = encode_categories(colleges)
+    count = len(colleges)
+    lats = np.empty(count, dtype='<f8')
+    lons = np.empty(count, dtype='<f8')
+    fields = np.empty((count, len(STRING_FIELDS) + 1), dtype='<u4')
+    cells = {}
+    for i, college in enumerate(colleges):
+        lats[i] = college['lat']
+        lons[i] = college['lon']
+        categories = college.get('categories', [])
+        fields[i] = [intern(college.get(field, '')) for field in STRING_FIELDS] + \
+            [intern(CATEGORY_SEPARATOR.join(categories))]
+        cells.setdefault(grid_cell(lats[i], lons[i], cell_deg), []).append(i)
+
+    cell_keys = np.array(sorted(cells), dtype='<i4').reshape(-1, 2)
+    cell_order = np.array([i for key in sorted(cells) for i in cells[key]], dtype='<u4')
+    cell_starts = np.zeros(len(cell_keys) + 1, dtype='<u4')
+    cell_starts[1:] = np.cumsum([len(cells[key]) for key in sorted(cells)])
+    category_ids = np.array([intern(name) for name in category_names], dtype='<u4')
+
+    encoded = [text.encode('utf-8') for text in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    string_offsets[1:] = np.cumsum([len(data) for data in encoded])
+    sections = [lats, lons, masks, fields, cell_order, cell_keys, cell_starts, category_ids, string_offsets]
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, count, len(encoded), len(category_names), len(cell_keys), cell_deg))
+        for section in sections:
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(section).tobytes())
+        f.write(b''.join(encoded))
+
+
+class PackedCatalog:
+    """
+    Read-only view of a packed catalog file.
+
+    Behaves like a sequence of college dicts (built on access) and exposes
+    the packed arrays for CollegeIndex: lats, lons, category_masks,
+    cell_deg and cells.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, n_strings, n_categories, n_cells, self.cell_deg = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed college catalog")
+        self.count = count
+
+        offset = HEADER.size
+
+        def section(dtype, shape):
+            nonlocal offset
+            offset = _align(offset)
+            size = int(np.prod(shape))
+            array = np.frombuffer(self._mmap, dtype=dtype, count=size, offset=offset).reshape(shape)
+            offset += array.nbytes
+            return array
+
+        self.lats = section('<f8', count)
+        self.lons = section('<f8', count)
+        self.category_masks = section('<u8', count)
+        self._fields = section('<u4', (count, len(STRING_FIELDS) + 1))
+        cell_order = section('<u4', count)
+        cell_keys = section('<i4', (n_cells, 2))
+        cell_starts = section('<u4', n_cells + 1)
+        category_ids = section('<u4', n_categories)
+        self._string_offsets = section('<u4', n_strings + 1)
+        self._string_base = offset
+
+        self.category_names = [self.string(int(i)) for i in category_ids]
+        self.cells = {
+            (int(lat_cell), int(lon_cell)): cell_order[cell_starts[i]:cell_starts[i + 1]]
+            for i, (lat_cell, lon_cell) in enumerate(cell_keys.tolist())
+        }
+
+    def string(self, string_id):
+        start = self._string_base + int(self._string_offsets[string_id])
+        end = self._string_base + int(self._string_offsets[string_id + 1])
+        return self._mmap[start:end].decode('utf-8')
+
+    def categories(self, mask):
+        """Category names set in a bitmask"""
+        mask = int(mask)
+        return [name for bit, name in enumerate(self.category_names) if mask >> bit & 1]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        string_ids = self._fields[i].tolist()
+        college = {field: self.string(string_id) for field, string_id in zip(STRING_FIELDS, string_ids)}
+        college['lat'] = float(self.lats[i])
+        college['lon'] = float(self.lons[i])
+        categories = self.string(string_ids[-1])
+        college['categories'] = categories.split(CATEGORY_SEPARATOR) if categories else []
+        return college
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help="JSON or CSV college catalog")
+    parser.add_argument('output', help="packed catalog to write, e.g. colleges.sihcat")
+    parser.add_argument('--cell-deg', type=float, default=0.5, help="grid cell size in degrees")
+    args = parser.parse_args()
+
+    from college_catalog import load_catalog
+    colleges = load_catalog(args.source)
+    build_packed_catalog(colleges, args.output, args.cell_deg)
+    print(f"Packed {len(colleges)} colleges into {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
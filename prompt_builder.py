@@ -0,0 +1,168 @@
+"""
+Compact prompt for the /recommend model call.
+
+Answers from the fixed question bank are sent as RIASEC weight codes
+("q7:E3") plus the summed profile instead of prose, free-text answers are
+quoted as-is, and the output shape is enforced with a JSON response schema
+rather than a worked example inside the prompt. estimate_tokens() keeps the
+prompt inside a token budget by trimming free text first.
+"""
+import re
+
+from response_cache import normalize_answers
+from riasec import RIASEC_CODES, option_weights
+
+RECOMMENDATION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'recommendations': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'title': {'type': 'string'},
+                    'score': {'type': 'string'},
+                    'description': {'type': 'string'},
+                    'details': {
+                        'type': 'object',
+                        'properties': {
+                            'avg_salary': {'type': 'string'},
+                            'growth': {'type': 'string'},
+                            'key_skills': {'type': 'array', 'items': {'type': 'string'}},
+                        },
+                        'required': ['avg_salary', 'growth', 'key_skills'],
+                    },
+                },
+                'required': ['title', 'score', 'description', 'details'],
+            },
+        },
+        'courses': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'title': {'type': 'string'},
+                    'description': {'type': 'string'},
+                    'eligibility': {'type': 'string'},
+                    'entrance': {'type': 'string'},
+                    'career_scope': {'type': 'string'},
+                },
+                'required': ['title', 'description', 'eligibility', 'entrance', 'career_scope'],
+            },
+        },
+    },
+    'required': ['recommendations', 'courses'],
+}
+
+# Ask for JSON matching the schema instead of describing it in the prompt
+GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': RECOMMENDATION_SCHEMA,
+}
+
+INSTRUCTIONS = (
+    "Career counselor for Indian students. Use the RIASEC model. "
+    "Return at least 5 career paths (score as \"NN% Match\", salary in ₹ LPA) "
+    "and 5 related Indian courses (eligibility, entrance exam, scope)."
+)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class PromptBudgetError(Exception):
+    """Raised when the answers can't be fit into the prompt's token budget"""
+
+
+def estimate_tokens(text):
+    """
+    Rough token count without calling the API.
+
+    Word pieces and punctuation each count as one token, and longer words
+    count once per four characters, which tracks SentencePiece tokenizers
+    closely enough for budgeting.
+    """
+    return sum(max(1, (len(piece) + 3) // 4) for piece in _TOKEN_RE.findall(text))
+
+
+def encode_answers(answers):
+    """
+    Split answers into RIASEC codes for question-bank options and raw free text.
+
+    Returns (codes, profile, free_text) where codes maps question id to a
+    code like "I2R1", profile is the summed weights, and free_text maps
+    question id to the answer text the bank doesn't know.
+    """
+    codes = {}
+    free_text = {}
+    profile = [0.0] * len(RIASEC_CODES)
+    for question, answer in normalize_answers(answers).items():
+        weights = option_weights(question, answer)
+        if weights is None:
+            free_text[question] = answer if isinstance(answer, str) else str(answer)
+            continue
+        codes[question] = ''.join(f"{code}{weight:g}" for code, weight in zip(RIASEC_CODES, weights) if weight) or '-'
+        profile = [total + weight for total, weight in zip(profile, weights)]
+    return codes, profile, free_text
+
+
+def render_prompt(codes, profile, free_text):
+    """Prompt text from the encoded answers"""
+    lines = [INSTRUCTIONS]
+    if codes:
+        lines.append("Answer codes: " + ' '.join(f"{question}:{code}" for question, code in codes.items()))
+        lines.append("Profile: " + ' '.join(f"{code}{total:g}" for code, total in zip(RIASEC_CODES, profile)))
+    if free_text:
+        lines.append("Free-text answers: " + '; '.join(f"{question}: {text}" for question, text in free_text.items()))
+    return '\n'.join(lines)
+
+
+def build_compact_prompt(answers, token_budget=300):
+    """
+    Compact prompt within token_budget estimated tokens.
+
+    Free-text answers are shortened, longest first, until the prompt fits;
+    if the coded part alone is over budget PromptBudgetError is raised.
+    """
+    codes, profile, free_text = encode_answers(answers)
+    prompt = render_prompt(codes, profile, free_text)
+    while estimate_tokens(prompt) > token_budget and free_text:
+        longest = max(free_text, key=lambda question: len(free_text[question]))
+        words = free_text[longest].split()
+        if len(words) <= 1:
+            del free_text[longest]
+        else:
+            free_text[longest] = ' '.join(words[:len(words) // 2]) + '…'
+        prompt = render_prompt(codes, profile, free_text)
+    if estimate_tokens(prompt) > token_budget:
+        raise PromptBudgetError(f"Prompt needs {estimate_tokens(prompt)} tokens, over the budget of {token_budget}")
+    return prompt
+
+
+_JSON_TYPES = {'object': dict, 'array': list, 'string': str}
+
+
+def matches_schema(value, schema):
+    """Whether value fits the subset of JSON Schema used by RECOMMENDATION_SCHEMA"""
+    expected = _JSON_TYPES.get(schema.get('type'))
+    if expected is not None and not isinstance(value, expected):
+        return False
+    if isinstance(value, dict):
+        if any(key not in value for key in schema.get('required', [])):
+            return False
+        properties = schema.get('properties', {})
+        return all(matches_schema(value[key], properties[key]) for key in value if key in properties)
+    if isinstance(value, list) and 'items' in schema:
+        return all(matches_schema(item, schema['items']) for item in value)
+    return True
+
+
+def validate_recommendations(data):
+    """Recommendations and courses that match the schema; malformed items are dropped"""
+    if not isinstance(data, dict):
+        raise ValueError("Model response is not a JSON object")
+    result = {}
+    for key in ('recommendations', 'courses'):
+        items = data.get(key)
+        item_schema = RECOMMENDATION_SCHEMA['properties'][key]['items']
+        result[key] = [item for item in items if matches_schema(item, item_schema)] if isinstance(items, list) else []
+    return result
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_answers(answers):
+    """Canonicalize quiz answers so equivalent answer sets share a cache key"""
+    if isinstance(answers, dict):
+        return {str(k).strip(): normalize_answers(v) for k, v in answers.items()}
+    if isinstance(answers, (list, tuple)):
+        return [normalize_answers(v) for v in answers]
+    if isinstance(answers, str):
+        return ' '.join(answers.split()).casefold()
+    return answers
+
+
+def make_cache_key(answers):
+    """Stable hash of the normalized answers dict"""
+    canonical = json.dumps(normalize_answers(answers), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with TTL expiry for model responses.
+
+    When db_path is given, entries are also written to a SQLite file so the
+    cache survives restarts; the in-memory LRU stays in front of it. The file
+    keeps at most max_db_rows entries, dropping those closest to expiry.
+    """
+
+    def __init__(self, max_size=1024, ttl_seconds=3600, db_path=None, max_db_rows=100000):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_db_rows = max_db_rows
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.db_path:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    with self._lock:
+                        self._store(key, value, row[1])
+                        self.hits += 1
+                    return value
+                if row:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at)
+                )
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_rows,)
+                )
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'persistent': bool(self.db_path),
+                'max_db_rows': self.max_db_rows if self.db_path else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
+
+
+def cache_from_env():
+    """Build the response cache from RESPONSE_CACHE_* environment variables"""
+    return ResponseCache(
+        max_size=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "86400")),
+        db_path=os.getenv("RESPONSE_CACHE_DB") or None,
+        max_db_rows=int(os.getenv("RESPONSE_CACHE_DB_ROWS", "100000"))
+    )
@@ -0,0 +1,307 @@
+"""
+Rule-based RIASEC scoring for the fixed quiz in script.js.
+
+Each answer option carries weights over the six Holland codes (Realistic,
+Investigative, Artistic, Social, Enterprising, Conventional). The summed
+profile is compared against local career and course catalogs by cosine
+similarity, which ranks everything in well under a millisecond. Answers
+that are not in the question bank (free text) return None so the caller
+can fall back to the LLM.
+"""
+import numpy as np
+
+from response_cache import normalize_answers
+
+RIASEC_CODES = ['R', 'I', 'A', 'S', 'E', 'C']
+
+
+def _vector(**weights):
+    return [float(weights.get(code, 0)) for code in RIASEC_CODES]
+
+
+# Weights per answer option, keyed by question id in script.js
+ANSWER_WEIGHTS = {
+    'q1': {
+        'Science': _vector(I=2, R=1),
+        'Mathematics': _vector(I=2, C=1),
+        'Arts': _vector(A=3),
+        'Commerce': _vector(E=2, C=2),
+    },
+    'q2': {
+        'Solving puzzles with numbers': _vector(I=2, C=1),
+        'Creating something artistic': _vector(A=3),
+        'Figuring out how things work': _vector(R=2, I=1),
+        'Exploring ideas with friends': _vector(S=2, E=1),
+    },
+    'q3': {
+        'Learning new tech stuff': _vector(I=2, R=1),
+        'Working with people': _vector(S=3),
+        'Doing something creative(like designing)': _vector(A=3),
+        'Exploring nature or environment': _vector(R=2, I=1),
+    },
+    'q4': {
+        'Breaking it down step-by-step logically': _vector(I=2, C=1),
+        'Going with your gut feeling and creativity': _vector(A=2, E=1),
+        'Asking others for a different perspective': _vector(S=2),
+        'Mixing both logic and creativity': _vector(I=1, A=1),
+    },
+    'q5': {
+        'Hands-on activities and making things': _vector(R=3),
+        'Reading and discussing ideas': _vector(I=1, A=1, S=1),
+        'Observing and analyzing before acting': _vector(I=2, C=1),
+        'Mixing both practical and theoretical approaches': _vector(R=1, I=1),
+    },
+    'q6': {
+        'Work on a team project': _vector(S=2, E=1),
+        'Go solo on something you\'re passionate about': _vector(R=1, I=1, A=1),
+        'Start alone and then collaborate': _vector(I=1, E=1),
+        'Support others as they lead': _vector(S=2, C=1),
+    },
+    'q7': {
+        'Scientist': _vector(I=3),
+        'Engineer': _vector(R=2, I=1),
+        'Writer': _vector(A=3),
+        'Designer/Artist': _vector(A=3),
+        'Entrepreneur': _vector(E=3),
+        'Teacher': _vector(S=3),
+        'Doctor': _vector(I=2, S=1),
+        'Environmentalist': _vector(R=2, I=1),
+    },
+    'q8': {
+        'Very exciting': _vector(I=2),
+        'Somewhat exciting': _vector(I=1),
+        'Not sure': _vector(),
+        'Not really my interest': _vector(),
+    },
+    'q9': {
+        'Very important': _vector(I=1, A=1, S=1),
+        'Important': _vector(I=0.5, A=0.5, S=0.5),
+        'Somewhat important': _vector(I=0.25, A=0.25, S=0.25),
+        'Not that important': _vector(),
+    },
+    'q10': {
+        'Strong subject knowledge': _vector(I=2, C=1),
+        'Practical skills': _vector(R=2),
+        'Problem-solving mindset': _vector(I=2),
+        'Teamwork and communication': _vector(S=2, E=1),
+    },
+    'q11': {
+        'Coding/Tech': _vector(I=2, R=1),
+        'Arts(Drawing, music, writing)': _vector(A=3),
+        'Sports/Outdoor': _vector(R=2, S=1),
+        'Other hobbies': _vector(),
+    },
+    'q12': {
+        'Figuring it out yourself': _vector(R=1, I=1),
+        'Asking friends for help': _vector(S=2),
+        'Looking for resources online': _vector(I=1, C=1),
+        'Combining all approaches': _vector(S=1, E=1),
+    },
+}
+
+CAREERS = [
+    {'title': 'Software Engineering', 'riasec': _vector(I=3, R=1, C=1),
+     'description': 'Build innovative software solutions.',
+     'details': {'avg_salary': '₹6–20 LPA', 'growth': 'Very High',
+                 'key_skills': ['Programming', 'Problem Solving', 'System Design', 'AI']}},
+    {'title': 'Data Science', 'riasec': _vector(I=3, C=2),
+     'description': 'Turn data into insights and predictive models.',
+     'details': {'avg_salary': '₹7–25 LPA', 'growth': 'Very High',
+                 'key_skills': ['Statistics', 'Python', 'Machine Learning', 'Communication']}},
+    {'title': 'Mechanical Engineering', 'riasec': _vector(R=3, I=2),
+     'description': 'Design and build machines and manufacturing systems.',
+     'details': {'avg_salary': '₹4–12 LPA', 'growth': 'Moderate',
+                 'key_skills': ['CAD', 'Thermodynamics', 'Prototyping', 'Problem Solving']}},
+    {'title': 'Medicine', 'riasec': _vector(I=3, S=2, R=1),
+     'description': 'Diagnose and treat patients.',
+     'details': {'avg_salary': '₹7–18 LPA', 'growth': 'High',
+                 'key_skills': ['Biology', 'Empathy', 'Critical Thinking', 'Communication']}},
+    {'title': 'Research Scientist', 'riasec': _vector(I=3, A=1),
+     'description': 'Investigate open questions through experiments and analysis.',
+     'details': {'avg_salary': '₹6–15 LPA', 'growth': 'High',
+                 'key_skills': ['Research Methods', 'Analysis', 'Curiosity', 'Scientific Writing']}},
+    {'title': 'Environmental Science', 'riasec': _vector(R=2, I=2, S=1),
+     'description': 'Study and protect ecosystems and natural resources.',
+     'details': {'avg_salary': '₹4–10 LPA', 'growth': 'High',
+                 'key_skills': ['Field Work', 'Ecology', 'Data Analysis', 'Policy']}},
+    {'title': 'Design', 'riasec': _vector(A=3, E=1, I=1),
+     'description': 'Create user-centered designs.',
+     'details': {'avg_salary': '₹5–12 LPA', 'growth': 'High',
+                 'key_skills': ['Creativity', 'UI/UX', 'Visual Communication', 'Research']}},
+    {'title': 'Architecture', 'riasec': _vector(A=2, R=2, I=1),
+     'description': 'Plan and design buildings and spaces.',
+     'details': {'avg_salary': '₹4–12 LPA', 'growth': 'Moderate',
+                 'key_skills': ['Drawing', 'Spatial Thinking', 'CAD', 'Project Planning']}},
+    {'title': 'Journalism & Content Writing', 'riasec': _vector(A=3, S=1, E=1),
+     'description': 'Tell stories and inform audiences across media.',
+     'details': {'avg_salary': '₹3–10 LPA', 'growth': 'Moderate',
+                 'key_skills': ['Writing', 'Research', 'Interviewing', 'Editing']}},
+    {'title': 'Teaching', 'riasec': _vector(S=3, A=1, I=1),
+     'description': 'Educate and mentor the next generation.',
+     'details': {'avg_salary': '₹3–8 LPA', 'growth': 'Stable',
+                 'key_skills': ['Communication', 'Patience', 'Subject Knowledge', 'Mentoring']}},
+    {'title': 'Psychology & Counselling', 'riasec': _vector(S=3, I=2),
+     'description': 'Understand behaviour and help people with their wellbeing.',
+     'details': {'avg_salary': '₹4–10 LPA', 'growth': 'High',
+                 'key_skills': ['Empathy', 'Listening', 'Assessment', 'Research']}},
+    {'title': 'Entrepreneurship', 'riasec': _vector(E=3, S=1, A=1),
+     'description': 'Start and grow your own ventures.',
+     'details': {'avg_salary': 'Varies widely', 'growth': 'High',
+                 'key_skills': ['Leadership', 'Risk Taking', 'Sales', 'Strategy']}},
+    {'title': 'Business Management', 'riasec': _vector(E=3, C=2, S=1),
+     'description': 'Lead teams and run organisations.',
+     'details': {'avg_salary': '₹6–20 LPA', 'growth': 'High',
+                 'key_skills': ['Leadership', 'Planning', 'Communication', 'Decision Making']}},
+    {'title': 'Chartered Accountancy', 'riasec': _vector(C=3, E=1, I=1),
+     'description': 'Manage audits, taxation and financial reporting.',
+     'details': {'avg_salary': '₹7–15 LPA', 'growth': 'High',
+                 'key_skills': ['Accounting', 'Taxation', 'Attention to Detail', 'Ethics']}},
+    {'title': 'Law', 'riasec': _vector(E=2, S=2, I=1, C=1),
+     'description': 'Advise clients and argue cases.',
+     'details': {'avg_salary': '₹5–20 LPA', 'growth': 'High',
+                 'key_skills': ['Reasoning', 'Public Speaking', 'Research', 'Negotiation']}},
+    {'title': 'Civil Services', 'riasec': _vector(S=2, E=2, C=2),
+     'description': 'Shape and implement public policy in government.',
+     'details': {'avg_salary': '₹7–15 LPA', 'growth': 'Stable',
+                 'key_skills': ['General Studies', 'Leadership', 'Ethics', 'Administration']}},
+    {'title': 'Sports & Fitness Coaching', 'riasec': _vector(R=3, S=2),
+     'description': 'Train athletes and promote active lifestyles.',
+     'details': {'avg_salary': '₹3–8 LPA', 'growth': 'Moderate',
+                 'key_skills': ['Fitness', 'Motivation', 'Physiology', 'Teamwork']}},
+]
+
+COURSES = [
+    {'title': 'B.Tech Computer Science (4 Years)', 'riasec': _vector(I=3, R=1, C=1),
+     'description': 'Covers programming, AI, and software systems.',
+     'eligibility': '12th PCM', 'entrance': 'JEE Main/Advanced', 'career_scope': 'Excellent'},
+    {'title': 'B.Sc Data Science (3 Years)', 'riasec': _vector(I=3, C=2),
+     'description': 'Statistics, programming and machine learning.',
+     'eligibility': '12th with Mathematics', 'entrance': 'CUET / University-specific', 'career_scope': 'Excellent'},
+    {'title': 'B.Tech Mechanical Engineering (4 Years)', 'riasec': _vector(R=3, I=2),
+     'description': 'Design, thermodynamics and manufacturing.',
+     'eligibility': '12th PCM', 'entrance': 'JEE Main', 'career_scope': 'Very Good'},
+    {'title': 'MBBS (5.5 Years)', 'riasec': _vector(I=3, S=2, R=1),
+     'description': 'Foundation for becoming a doctor.',
+     'eligibility': '12th PCB', 'entrance': 'NEET', 'career_scope': 'Excellent'},
+    {'title': 'B.Sc Physics/Chemistry/Biology (3 Years)', 'riasec': _vector(I=3, R=1),
+     'description': 'Core sciences with lab work, a route into research.',
+     'eligibility': '12th Science', 'entrance': 'CUET / IISER Aptitude Test', 'career_scope': 'Very Good'},
+    {'title': 'B.Sc Environmental Science (3 Years)', 'riasec': _vector(R=2, I=2, S=1),
+     'description': 'Ecology, conservation and environmental policy.',
+     'eligibility': '12th Science', 'entrance': 'CUET', 'career_scope': 'Good'},
+    {'title': 'B.Des (4 Years)', 'riasec': _vector(A=3, E=1, I=1),
+     'description': 'Focuses on design thinking and creative skills.',
+     'eligibility': '12th Any Stream', 'entrance': 'NID/CEED', 'career_scope': 'Very Good'},
+    {'title': 'B.Arch (5 Years)', 'riasec': _vector(A=2, R=2, I=1),
+     'description': 'Architectural design, structures and planning.',
+     'eligibility': '12th PCM', 'entrance': 'NATA / JEE Main Paper 2', 'career_scope': 'Good'},
+    {'title': 'BA Journalism & Mass Communication (3 Years)', 'riasec': _vector(A=3, S=1, E=1),
+     'description': 'Reporting, writing and media production.',
+     'eligibility': '12th Any Stream', 'entrance': 'CUET / University-specific', 'career_scope': 'Good'},
+    {'title': 'B.A. B.Ed (4 Years)', 'riasec': _vector(S=3, A=1, I=1),
+     'description': 'Integrated degree for becoming a school teacher.',
+     'eligibility': '12th Any Stream', 'entrance': 'NCET', 'career_scope': 'Good'},
+    {'title': 'BA Psychology (3 Years)', 'riasec': _vector(S=3, I=2),
+     'description': 'Human behaviour, counselling and research methods.',
+     'eligibility': '12th Any Stream', 'entrance': 'CUET', 'career_scope': 'Very Good'},
+    {'title': 'BBA (3 Years)', 'riasec': _vector(E=3, C=2, S=1),
+     'description': 'Management, marketing and entrepreneurship basics.',
+     'eligibility': '12th Any Stream', 'entrance': 'IPMAT / CUET', 'career_scope': 'Very Good'},
+    {'title': 'B.Com (Hons) + CA Foundation', 'riasec': _vector(C=3, E=1, I=1),
+     'description': 'Accounting, finance and taxation.',
+     'eligibility': '12th Any Stream (Maths preferred)', 'entrance': 'CUET / CA Foundation', 'career_scope': 'Very Good'},
+    {'title': 'BA LLB (5 Years)', 'riasec': _vector(E=2, S=2, I=1, C=1),
+     'description': 'Integrated law degree with humanities.',
+     'eligibility': '12th Any Stream', 'entrance': 'CLAT / AILET', 'career_scope': 'Excellent'},
+    {'title': 'BA Political Science (3 Years)', 'riasec': _vector(S=2, E=2, C=2),
+     'description': 'Governance and public policy, a common route to civil services.',
+     'eligibility': '12th Any Stream', 'entrance': 'CUET', 'career_scope': 'Good'},
+    {'title': 'B.P.Ed (3-4 Years)', 'riasec': _vector(R=3, S=2),
+     'description': 'Physical education, sports science and coaching.',
+     'eligibility': '12th Any Stream', 'entrance': 'University-specific', 'career_scope': 'Good'},
+]
+
+
+def _unit_rows(items):
+    matrix = np.array([item['riasec'] for item in items], dtype=np.float64)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+CAREER_MATRIX = _unit_rows(CAREERS)
+COURSE_MATRIX = _unit_rows(COURSES)
+
+# Lookup by normalized option text so casing and spacing don't matter
+_NORMALIZED_WEIGHTS = {
+    question: {normalize_answers(option): weights for option, weights in options.items()}
+    for question, options in ANSWER_WEIGHTS.items()
+}
+
+
+def option_weights(question, answer):
+    """
+    RIASEC weights for a normalized answer, or None if it isn't a
+    question-bank option. Options are strings, so list or dict answers are
+    free text.
+    """
+    if not isinstance(answer, str):
+        return None
+    return _NORMALIZED_WEIGHTS.get(question, {}).get(answer)
+
+
+def score_answers(answers, skip_unknown=False):
+    """
+    RIASEC profile for quiz answers as a length-6 array.
+
+    Returns None if any answer is not an option from the question bank
+    (unless skip_unknown, which scores only the answers that are), or if
+    the answers carry no signal at all.
+    """
+    normalized = normalize_answers(answers)
+    if not isinstance(normalized, dict) or not normalized:
+        return None
+
+    rows = []
+    for question, answer in normalized.items():
+        weights = option_weights(question, answer)
+        if weights is None:
+            if skip_unknown:
+                continue
+            return None
+        rows.append(weights)
+    if not rows:
+        return None
+
+    profile = np.sum(np.array(rows, dtype=np.float64), axis=0)
+    if not profile.any():
+        return None
+    return profile
+
+
+def rank(profile, matrix, items, count):
+    """Top items by cosine similarity to the profile, with a match score"""
+    similarity = matrix @ (profile / np.linalg.norm(profile))
+    ranked = []
+    for i in np.argsort(-similarity, kind='stable')[:count]:
+        item = {key: value for key, value in items[i].items() if key != 'riasec'}
+        item['score'] = f"{int(round(similarity[i] * 100))}% Match"
+        ranked.append(item)
+    return ranked
+
+
+def recommend(answers, career_count=5, course_count=5, skip_unknown=False):
+    """
+    Recommendations and courses for fixed-bank answers, or None for the LLM
+    to handle. With skip_unknown, free-text answers are ignored instead.
+    """
+    profile = score_answers(answers, skip_unknown)
+    if profile is None:
+        return None
+
+    courses = rank(profile, COURSE_MATRIX, COURSES, course_count)
+    for course in courses:
+        del course['score']
+    return {
+        'recommendations': rank(profile, CAREER_MATRIX, CAREERS, career_count),
+        'courses': courses,
+        'riasec_profile': {code: round(float(value), 2) for code, value in zip(RIASEC_CODES, profile)}
+    }
@@ -274,43 +274,56 @@ async function submitQuiz() {
       }
     }
 
-    const response = await fetch("http://127.0.0.1:5000/recommend", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        answers: userAnswers,
-        location: userLocation,
-      }),
-    });
-    const data = await response.json();
+    // Stream results so each card shows up as soon as the model produces it
+    const recommendations = [];
+    const streamedCourses = [];
+    let nearbyColleges = [];
+    let resultsShown = false;
+
+    const showResults = () => {
+      if (resultsShown) return;
+      resultsShown = true;
+      recommendationsContainer.innerHTML = "";
+      coursesContainer.innerHTML = "";
+      if (coursesWrapper) coursesWrapper.style.display = "block";
+      showLoader(false);
+      showPage("recommendations");
+    };
+
+    await streamRecommendations(
+      { answers: userAnswers, location: userLocation },
+      (event, data) => {
+        if (event === "recommendation") {
+          showResults();
+          recommendations.push(data);
+          recommendationsContainer.appendChild(createRecommendationCard(data));
+        } else if (event === "course") {
+          showResults();
+          streamedCourses.push(data);
+          coursesContainer.appendChild(createCourseCard(data));
+        } else if (event === "nearby_colleges") {
+          nearbyColleges = data.nearby_colleges || [];
+        } else if (event === "error") {
+          console.error("Recommendation stream error:", data.error);
+        }
+      }
+    );
 
-    // Display recommendations
-    displayRecommendations(data.recommendations);
+    if (recommendations.length === 0) {
+      displayRecommendations(recommendations);
+    }
 
     // Display courses
-    const fallbackCourses = generateCoursesFromRecommendations(
-      data.recommendations || []
-    );
-    const courses =
-      Array.isArray(data.courses) && data.courses.length > 0
-        ? data.courses
-        : fallbackCourses;
-    displayCourses(courses);
+    if (streamedCourses.length === 0) {
+      displayCourses(generateCoursesFromRecommendations(recommendations));
+    }
 
     // Display nearby colleges from Geoapify API
-    console.log("Backend response data:", data);
-    console.log("Nearby colleges data:", data.nearby_colleges);
-    console.log(
-      "Nearby colleges length:",
-      data.nearby_colleges ? data.nearby_colleges.length : "undefined"
-    );
+    console.log("Nearby colleges data:", nearbyColleges);
 
-    if (data.nearby_colleges && data.nearby_colleges.length > 0) {
-      console.log(
-        "Displaying nearby colleges from backend:",
-        data.nearby_colleges
-      );
-      displayNearbyColleges(data.nearby_colleges);
+    if (nearbyColleges.length > 0) {
+      console.log("Displaying nearby colleges from backend:", nearbyColleges);
+      displayNearbyColleges(nearbyColleges);
     } else {
       console.log("No nearby colleges from backend, using local fallback");
       // Fallback to local college search
@@ -339,15 +352,55 @@ function displayRecommendations(recs) {
 
   // Now loop through each recommendation to create a card
   recs.forEach((rec) => {
-    const recCard = document.createElement("div");
-    recCard.className = "result-card";
-    recCard.innerHTML = `
+    recommendationsContainer.appendChild(createRecommendationCard(rec));
+  });
+}
+
+function createRecommendationCard(rec) {
+  const recCard = document.createElement("div");
+  recCard.className = "result-card";
+  recCard.innerHTML = `
             <h3>${rec.title}</h3>
             <p class="match-score">Match Score: ${rec.score}</p>
             <p>${rec.description}</p>
         `;
-    recommendationsContainer.appendChild(recCard);
+  return recCard;
+}
+
+// POST to the streaming endpoint and hand each Server-Sent Event to onEvent
+async function streamRecommendations(body, onEvent) {
+  const response = await fetch("http://127.0.0.1:5000/recommend/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
   });
+  if (!response.ok || !response.body) {
+    throw new Error(`Recommendation request failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      message.split("\n").forEach((line) => {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      });
+      if (data) onEvent(event, JSON.parse(data));
+    }
+  }
 }
 
 function displayCourses(courses) {
@@ -357,9 +410,15 @@ function displayCourses(courses) {
   }
   coursesContainer.innerHTML = "";
   courses.forEach((course) => {
-    const div = document.createElement("div");
-    div.className = "result-card";
-    div.innerHTML = `
+    coursesContainer.appendChild(createCourseCard(course));
+  });
+  coursesWrapper.style.display = "block";
+}
+
+function createCourseCard(course) {
+  const div = document.createElement("div");
+  div.className = "result-card";
+  div.innerHTML = `
             <h3>${course.title}</h3>
             <p>${course.description || ""}</p>
             ${
@@ -378,9 +437,7 @@ function displayCourses(courses) {
                 : ""
             }
         `;
-    coursesContainer.appendChild(div);
-  });
-  coursesWrapper.style.display = "block";
+  return div;
 }
 
 function displayNearbyColleges(colleges) {
@@ -419,6 +476,13 @@ function displayNearbyColleges(colleges) {
               )}</p>`
             : ""
         }
+        ${
+          college.course_match && college.course_match.length > 0
+            ? `<p><strong>Matches your courses:</strong> ${college.course_match.join(
+                ", "
+              )}</p>`
+            : ""
+        }
       `;
       nearbyCollegesContainer.appendChild(div);
     });
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from response_cache import normalize_answers
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def embed_answers(answers, dim=1024):
+    """
+    Unit-length hashed bag-of-words vector for a quiz answer set.
+
+    Tokens and bigrams are prefixed with their question id so the same word
+    under different questions doesn't collide, and the whole answer counts
+    as one extra feature so identical options dominate the similarity. Each
+    question contributes equal weight, so a small edit to one free-text
+    field only moves the vector a little. crc32 keeps the hashing stable
+    across processes for persistence.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    normalized = normalize_answers(answers)
+    if not isinstance(normalized, dict):
+        normalized = {'': normalized}
+
+    for question, answer in normalized.items():
+        text = answer if isinstance(answer, str) else json.dumps(answer, sort_keys=True)
+        tokens = _TOKEN_RE.findall(text)
+        features = [(f"{question}={text}", 2.0)]
+        features += [(f"{question}:{token}", 1.0) for token in tokens]
+        features += [(f"{question}:{a} {b}", 1.0) for a, b in zip(tokens, tokens[1:])]
+        scale = 1.0 / np.sqrt(sum(weight * weight for _, weight in features))
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % dim] += (weight if h & 0x80000000 else -weight) * scale
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Similarity cache for model responses over a flat in-memory vector index.
+
+    A lookup returns the cached response of the most similar stored answer
+    set when its cosine similarity reaches threshold. Entries expire after
+    ttl_seconds and the least recently used one is replaced when full. With
+    db_path set, entries are also kept in SQLite and reloaded on start.
+    """
+
+    def __init__(self, threshold=0.95, max_size=2048, ttl_seconds=86400, dim=1024, db_path=None):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+        self.db_path = db_path
+        self._vectors = np.zeros((max_size, dim), dtype=np.float32)
+        self._keys = [None] * max_size
+        self._values = [None] * max_size
+        self._expires_at = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._slots = {}
+        self._free = list(range(max_size - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hit_similarity_total = 0.0
+        if db_path:
+            self._load()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _load(self):
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_responses "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM semantic_responses WHERE expires_at <= ?", (time.time(),))
+            rows = conn.execute(
+                "SELECT key, vector, value, expires_at FROM semantic_responses "
+                "ORDER BY expires_at DESC LIMIT ?", (self.max_size,)
+            ).fetchall()
+        for key, blob, value, expires_at in reversed(rows):
+            vector = np.frombuffer(blob, dtype=np.float32)
+            if vector.shape[0] == self.dim:
+                self._store(key, vector, json.loads(value), expires_at)
+
+    def get(self, answers):
+        """Cached response for the nearest answer set above threshold, or None"""
+        query = embed_answers(answers, self.dim)
+        now = time.time()
+        with self._lock:
+            if self._slots:
+                similarity = self._vectors @ query
+                # Empty and expired slots can never match
+                similarity[self._expires_at <= now] = -1.0
+                best = int(np.argmax(similarity))
+                if similarity[best] >= self.threshold:
+                    self._last_used[best] = now
+                    self.hits += 1
+                    self._hit_similarity_total += float(similarity[best])
+                    return self._values[best]
+            self.misses += 1
+            return None
+
+    def set(self, key, answers, value):
+        vector = embed_answers(answers, self.dim)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, vector, value, expires_at)
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO semantic_responses (key, vector, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, vector.astype(np.float32).tobytes(), json.dumps(value), expires_at)
+                )
+
+    def _store(self, key, vector, value, expires_at):
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                # Prefer an expired slot, otherwise the least recently used
+                slot = int(np.argmin(np.where(self._expires_at <= time.time(), -1.0, self._last_used)))
+                del self._slots[self._keys[slot]]
+                self.evictions += 1
+                if self.db_path:
+                    with self._connect() as conn:
+                        conn.execute("DELETE FROM semantic_responses WHERE key = ?", (self._keys[slot],))
+            self._slots[key] = slot
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._vectors[slot] = vector
+        self._expires_at[slot] = expires_at
+        self._last_used[slot] = time.time()
+
+    def clear(self):
+        with self._lock:
+            self._vectors[:] = 0
+            self._keys = [None] * self.max_size
+            self._values = [None] * self.max_size
+            self._expires_at[:] = 0
+            self._slots.clear()
+            self._free = list(range(self.max_size - 1, -1, -1))
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM semantic_responses")
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._slots),
+                'max_size': self.max_size,
+                'threshold': self.threshold,
+                'persistent': bool(self.db_path),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'mean_hit_similarity': round(self._hit_similarity_total / self.hits, 4) if self.hits else None
+            }
+
+
+def semantic_cache_from_env():
+    """Build the similarity cache from SEMANTIC_CACHE_* environment variables, or None if disabled"""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    return SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+        max_size=int(os.getenv("SEMANTIC_CACHE_SIZE", "2048")),
+        ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", "86400")),
+        db_path=os.getenv("SEMANTIC_CACHE_DB") or None
+    )
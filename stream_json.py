@@ -0,0 +1,198 @@
+import json
+import threading
+
+
+class StreamingArrayParser:
+    """
+    Incremental parser for a JSON object that arrives in text chunks.
+
+    Emits each element of the named top-level arrays as soon as the element
+    is complete, without waiting for the rest of the document. Anything
+    before the first '{' (such as a ```json fence) is skipped.
+    """
+
+    def __init__(self, keys=('recommendations', 'courses')):
+        self.keys = set(keys)
+        self.buffer = ''
+        self.pos = 0
+        self.started = False
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.last_string = None
+        self.current_key = None
+        self.array_key = None
+        self.item_start = None
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return completed (key, item) pairs"""
+        self.buffer += chunk
+        items = []
+        buffer = self.buffer
+        while self.pos < len(buffer):
+            ch = buffer[self.pos]
+
+            if not self.started:
+                if ch == '{':
+                    self.started = True
+                    self.stack.append('{')
+                self.pos += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                    self.last_string = buffer[self.string_start + 1:self.pos]
+                    if self._in_array_item_slot() and self.item_start == self.string_start:
+                        items.append(self._emit(self.pos + 1))
+                self.pos += 1
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                self.string_start = self.pos
+                if self._in_array_item_slot() and self.item_start is None:
+                    self.item_start = self.pos
+            elif ch == ':' and len(self.stack) == 1:
+                self.current_key = self.last_string
+            elif ch in '{[':
+                if self._in_array_item_slot() and self.item_start is None:
+                    self.item_start = self.pos
+                if ch == '[' and len(self.stack) == 1 and self.current_key in self.keys:
+                    self.array_key = self.current_key
+                self.stack.append(ch)
+            elif ch in '}]':
+                if self.stack:
+                    self.stack.pop()
+                if self._in_array_item_slot() and self.item_start is not None:
+                    items.append(self._emit(self.pos + 1))
+                elif len(self.stack) == 1 and ch == ']':
+                    self.array_key = None
+            self.pos += 1
+        return [item for item in items if item is not None]
+
+    def _in_array_item_slot(self):
+        return self.array_key is not None and len(self.stack) == 2
+
+    def _emit(self, end):
+        text = self.buffer[self.item_start:end]
+        self.item_start = None
+        try:
+            return (self.array_key, json.loads(text))
+        except json.JSONDecodeError:
+            return None
+
+    @property
+    def text(self):
+        """Everything fed so far"""
+        return self.buffer
+
+
+def remove_trailing_commas(text):
+    """text with commas directly before a closing } or ] dropped, leaving string contents alone"""
+    out = []
+    pending_comma = None
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            pending_comma = None
+        elif ch == ',':
+            pending_comma = len(out)
+        elif ch in '}]':
+            if pending_comma is not None:
+                out[pending_comma] = ''
+            pending_comma = None
+        elif not ch.isspace():
+            pending_comma = None
+        out.append(ch)
+    return ''.join(out)
+
+
+def extract_json_object(text):
+    """The first balanced {...} in text, skipping fences and chatter, or None if it never closes"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def parse_model_json(text, keys=('recommendations', 'courses')):
+    """
+    Tolerantly parse a model's JSON answer.
+
+    Returns (data, status) where status is 'complete', 'repaired' (trailing
+    commas removed) or 'partial' (truncated output; data holds only the
+    array items that were fully generated). Raises ValueError when nothing
+    can be recovered.
+    """
+    candidate = extract_json_object(text)
+    if candidate is not None:
+        try:
+            return json.loads(candidate), 'complete'
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(remove_trailing_commas(candidate)), 'repaired'
+        except json.JSONDecodeError:
+            pass
+
+    # Truncated or malformed: keep every array element that closed cleanly
+    data = {key: [] for key in keys}
+    for key, item in StreamingArrayParser(keys=keys).feed(remove_trailing_commas(text)):
+        data[key].append(item)
+    if not any(data.values()):
+        raise ValueError("No JSON object could be recovered from the model response")
+    return data, 'partial'
+
+
+class ParseStats:
+    """Thread-safe counters for model output parsing outcomes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {'complete': 0, 'repaired': 0, 'partial': 0, 'failed': 0, 'reinvocations': 0}
+
+    def record(self, outcome):
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        parsed = counts['complete'] + counts['repaired'] + counts['partial'] + counts['failed']
+        counts['failure_rate'] = round(counts['failed'] / parsed, 4) if parsed else 0.0
+        return counts
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from college_index import CollegeIndex
+from course_matching import DISCIPLINES
+from geo_distance import haversine_one_to_many
+from packed_catalog import PackedCatalog, build_packed_catalog
+
+CATEGORIES = sorted(DISCIPLINES) + ['hostel', 'autonomous']
+
+
+def random_colleges(rng, count):
+    colleges = []
+    for i in range(count):
+        if i % 4:
+            # Clustered like the real catalog
+            lat, lon = rng.uniform(8, 35), rng.uniform(68, 97)
+        else:
+            # Poles and the antimeridian exercise the grid's edge cases
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        categories = rng.sample(CATEGORIES, rng.randint(0, 3))
+        colleges.append({'name': f'College {i}', 'lat': lat, 'lon': lon, 'categories': categories})
+    return colleges
+
+
+@pytest.fixture(scope='module')
+def colleges():
+    return random_colleges(random.Random(7), 20000)
+
+
+@pytest.fixture(scope='module', params=['json', 'packed'])
+def index(request, colleges, tmp_path_factory):
+    if request.param == 'json':
+        return CollegeIndex(colleges)
+    path = tmp_path_factory.mktemp('catalog') / 'colleges.sihcat'
+    build_packed_catalog(colleges, path)
+    return CollegeIndex(PackedCatalog(path))
+
+
+def queries(count=300):
+    rng = random.Random(11)
+    for i in range(count):
+        if i % 3:
+            lat, lon = rng.uniform(8, 35), rng.uniform(68, 97)
+        else:
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        yield lat, lon, rng.choice([1, 5, 25, 100, 400, 2500])
+
+
+@pytest.fixture(scope='module')
+def scan(colleges):
+    lats = np.array([college['lat'] for college in colleges])
+    lons = np.array([college['lon'] for college in colleges])
+
+    def scan(lat, lon, radius_km):
+        """(index, distance_km) of every college within radius_km, by a full scan"""
+        distances = haversine_one_to_many(lat, lon, lats, lons)
+        within = np.flatnonzero(distances <= radius_km)
+        return [(int(i), float(distances[i])) for i in within]
+    return scan
+
+
+def test_within_radius_matches_a_full_scan(colleges, index, scan):
+    for lat, lon, radius_km in queries():
+        expected = [(colleges[i]['name'], d) for i, d in scan(lat, lon, radius_km)]
+        got = [(college['name'], d) for college, d in index.within_radius(lat, lon, radius_km)]
+        assert got == expected, (lat, lon, radius_km)
+
+
+def test_ranked_within_matches_a_brute_force_ranking(colleges, index, scan):
+    rng = random.Random(13)
+    for lat, lon, radius_km in queries():
+        tags = set(rng.sample(sorted(DISCIPLINES), rng.randint(0, 3)))
+        limit = rng.choice([None, 1, 10])
+        ranked = []
+        for i, d in scan(lat, lon, radius_km):
+            matched = sorted(tags & set(colleges[i]['categories']))
+            ranked.append((-len(matched), d, i, matched))
+        ranked.sort(key=lambda row: row[:3])
+        expected = [(colleges[i]['name'], d, matched) for _, d, i, matched in ranked[:limit]]
+        got = [(college['name'], d, matched) for college, d, matched in index.ranked_within(lat, lon, radius_km, tags, limit)]
+        assert got == expected, (lat, lon, radius_km, tags, limit)
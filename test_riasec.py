@@ -0,0 +1,30 @@
+from prompt_builder import build_compact_prompt, encode_answers
+from riasec import option_weights, recommend, score_answers
+
+
+def test_bank_answers_are_scored_locally():
+    result = recommend({'q1': 'Science'})
+    assert result is not None
+    assert len(result['recommendations']) == 5
+    assert len(result['courses']) == 5
+
+
+def test_option_lookup_ignores_case_and_spacing():
+    assert option_weights('q1', 'science') is not None
+    assert option_weights('q1', 'Basket weaving') is None
+
+
+def test_list_and_dict_answers_are_free_text():
+    assert option_weights('q1', ['science']) is None
+    assert option_weights('q1', {'a': 'science'}) is None
+    answers = {'q1': 'Science', 'hobbies': ['chess', 'coding'], 'extra': {'likes': 'maths'}}
+    assert score_answers(answers) is None
+    assert recommend(answers) is None
+    assert recommend(answers, skip_unknown=True) is not None
+
+
+def test_list_answers_go_to_the_prompt_as_free_text():
+    codes, _, free_text = encode_answers({'q1': 'Science', 'hobbies': ['chess', 'coding']})
+    assert list(codes) == ['q1']
+    assert 'chess' in free_text['hobbies']
+    assert 'chess' in build_compact_prompt({'hobbies': ['chess', 'coding']})
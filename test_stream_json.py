@@ -0,0 +1,70 @@
+import pytest
+
+from stream_json import StreamingArrayParser, parse_model_json, remove_trailing_commas
+
+COURSE = '{"title": "B.Tech", "description": "d", "eligibility": "e", "entrance": "JEE", "career_scope": "s"}'
+
+
+def test_complete_json_is_parsed_as_is():
+    data, status = parse_model_json('{"recommendations": [], "courses": [%s]}' % COURSE)
+    assert status == 'complete'
+    assert data['courses'][0]['entrance'] == 'JEE'
+
+
+def test_fenced_json_with_chatter():
+    text = 'Here you go:\n```json\n{"recommendations": [], "courses": []}\n```\nGood luck!'
+    assert parse_model_json(text) == ({'recommendations': [], 'courses': []}, 'complete')
+
+
+def test_trailing_commas_are_repaired():
+    data, status = parse_model_json('{"recommendations": [{"title": "A",},], "courses": [],}')
+    assert status == 'repaired'
+    assert data == {'recommendations': [{'title': 'A'}], 'courses': []}
+
+
+@pytest.mark.parametrize('value', ['a, ]', 'a,}', 'x,   ]', 'quote \\", ]'])
+def test_repair_leaves_string_contents_alone(value):
+    text = '{"recommendations": [{"title": "%s"},], "courses": []}' % value
+    data, status = parse_model_json(text)
+    assert status == 'repaired'
+    assert data['recommendations'][0]['title'] == value.replace('\\"', '"')
+
+
+def test_remove_trailing_commas():
+    assert remove_trailing_commas('[1, 2 ,\n ]') == '[1, 2 \n ]'
+    assert remove_trailing_commas('{"a": "b,}",}') == '{"a": "b,}"}'
+    assert remove_trailing_commas('[1, 2]') == '[1, 2]'
+
+
+def test_truncated_output_keeps_complete_items():
+    text = '{"recommendations": [{"title": "A"}, {"title": "B"}, {"title": "C", "desc'
+    data, status = parse_model_json(text)
+    assert status == 'partial'
+    assert [item['title'] for item in data['recommendations']] == ['A', 'B']
+    assert data['courses'] == []
+
+
+def test_truncated_output_with_trailing_comma_in_string():
+    text = '{"courses": [%s, {"title": "a, ]", "description": "d"},' % COURSE
+    data, status = parse_model_json(text)
+    assert status == 'partial'
+    assert [item['title'] for item in data['courses']] == ['B.Tech', 'a, ]']
+
+
+def test_nothing_recoverable_raises():
+    with pytest.raises(ValueError):
+        parse_model_json('I cannot help with that.')
+    with pytest.raises(ValueError):
+        parse_model_json('{"recommendations": [{"title": "A"')
+
+
+def test_streaming_parser_emits_items_across_chunks():
+    parser = StreamingArrayParser()
+    text = '```json\n{"recommendations": [{"title": "A, ]"}, {"title": "B"}], "courses": [%s]}' % COURSE
+    items = []
+    for i in range(0, len(text), 7):
+        items.extend(parser.feed(text[i:i + 7]))
+    assert [(key, item['title']) for key, item in items] == [
+        ('recommendations', 'A, ]'), ('recommendations', 'B'), ('courses', 'B.Tech')
+    ]
+    assert parser.text == text